@@ -1,6 +1,8 @@
+import asyncio
 import logging
+import time
 from openai_client import OpenAIClient
-from user_preferences import UserPreferences
+from user_preferences import UserPreferences, caption_features
 from database_client import DatabaseClient
 from social_media.instagram_api import InstagramIntegration
 from social_media.twitter import TwitterIntegration
@@ -15,6 +17,8 @@ class SocialBot:
     and managing followers across different platforms like Instagram and Twitter.
     """
 
+    CAPTIONS_CACHE_TTL = 300  # Seconds before the cached captions table is refreshed
+
     def __init__(self, config_manager: ConfigManager, openai_client: OpenAIClient, database_client: DatabaseClient, user_preferences: UserPreferences, interactive=False):
         """
         Initialize the SocialBot with configuration and set up platform integrations.
@@ -33,6 +37,8 @@ class SocialBot:
         self.database_client = database_client
         self.user_preferences = user_preferences
         self.response_generator = ResponseGenerator(openai_client, database_client, user_preferences)
+        self._captions_cache = None
+        self._captions_cached_at = 0.0
         self.logger.info("SocialBot initialized with integrations for Instagram and Twitter.")
 
     def post_image(self, platform, caption_text=None, schedule_time=None):
@@ -56,7 +62,7 @@ class SocialBot:
         try:
             if not caption_text:
                 # Retrieve captions from the database
-                captions = self.database_client.get_data("captions")
+                captions = self._get_captions()
                 generated_captions = self.database_client.get_data("generated_captions")
                 if not captions:
                     self.logger.error("No captions found in the database.")
@@ -101,6 +107,22 @@ class SocialBot:
             raise
 
 
+    def _get_captions(self):
+        """
+        Retrieve the captions table, reusing the last result for CAPTIONS_CACHE_TTL seconds.
+
+        Returns:
+            list: The caption rows from the database.
+        """
+        now = time.monotonic()
+        if not self._captions_cache or now - self._captions_cached_at > self.CAPTIONS_CACHE_TTL:
+            self._captions_cache = self.database_client.get_data("captions")
+            self._captions_cached_at = now
+            # Warm the caption features cache once per fetch rather than on the first selection.
+            for caption in self._captions_cache or ():
+                caption_features(caption)
+        return self._captions_cache
+
     def post_comment(self, platform, media_id, comment_text=None):
         """
         Post a comment on the specified post on a given platform.
@@ -135,7 +157,7 @@ class SocialBot:
 
             # Generate a personalized comment if not provided
             if not comment_text:
-                comment_text = self.response_generator.generate_personalized_comment(context, platform)
+                comment_text = asyncio.run(self.response_generator.generate_personalized_comment(context))
                 self.logger.debug(f"Generated comment: {comment_text}")
 
             if self.interactive:
@@ -193,7 +215,7 @@ class SocialBot:
 
                 # Generate a personalized reply if not provided
                 if not reply_text:
-                    reply_text = self.response_generator.generate_personalized_reply(context, platform)
+                    reply_text = asyncio.run(self.response_generator.generate_personalized_reply(context))
                     self.logger.debug(f"Generated reply: {reply_text}")
 
                 if self.interactive:
@@ -51,6 +51,7 @@ class ConfigManager:
                 'twitter_api_secret_key': os.getenv('TWITTER_API_SECRET_KEY'),
                 'twitter_access_token': os.getenv('TWITTER_ACCESS_TOKEN'),
                 'twitter_access_token_secret': os.getenv('TWITTER_ACCESS_TOKEN_SECRET'),
+                'prewarm_user_ids': self._parse_user_ids('PREWARM_USER_IDS'),
             })
             self.logger.info("Configuration loaded successfully.")
         except Exception as e:
@@ -71,6 +72,26 @@ class ConfigManager:
             raise ValueError(f"Environment variable {var_name} is missing or empty.")
         return value
 
+    def _parse_user_ids(self, var_name):
+        """
+        Parse a comma-separated list of user IDs from an environment variable.
+
+        Entries that aren't integers are logged and skipped rather than failing the whole configuration.
+
+        :param var_name: The name of the environment variable to parse.
+        :return: A list of the valid user IDs, in order.
+        """
+        user_ids = []
+        for entry in os.getenv(var_name, '').split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            try:
+                user_ids.append(int(entry))
+            except ValueError:
+                self.logger.warning(f"Ignoring invalid user ID '{entry}' in {var_name}.")
+        return user_ids
+
     def get(self, key, default=None):
         """
         Retrieve a configuration value.
@@ -1,6 +1,16 @@
 import logging
-from bot.crawler.instapy import InstaPy
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from instapy import InstaPy
+except ImportError as e:
+    raise ImportError(
+        "The InstaPy crawler needs the optional instapy package. "
+        "Install it with `poetry install --extras crawler` or `pip install instapy`."
+    ) from e
 from social_media.instagram_api import InstagramIntegration
+from social_media.rate_limiter import SlidingWindowLimiter
 
 class InstaPyIntegration:
     """
@@ -14,11 +24,22 @@ class InstaPyIntegration:
         headless_browser (bool): Whether to run the browser in headless mode.
         proxy_address (str): Proxy address for the session.
         proxy_port (str): Proxy port for the session.
+        disable_image_load (bool): Whether the browser skips loading images.
         session (InstaPy): The InstaPy session instance.
         instagram_api (InstagramIntegration): The Instagram API integration instance.
     """
 
-    def __init__(self, username, password, access_token, headless_browser=True, proxy_address=None, proxy_port=None):
+    # Queued comments are flushed automatically once a full Graph API batch is pending.
+    COMMENT_BATCH_SIZE = InstagramIntegration.BATCH_SIZE
+    # Instagram throttles each account at roughly 200 actions per hour.
+    RATE_LIMIT_CALLS = 199
+    RATE_LIMIT_PERIOD = 3600
+
+    _limiters = {}
+    _limiters_lock = threading.Lock()
+
+    def __init__(self, username, password, access_token, headless_browser=True, proxy_address=None, proxy_port=None,
+                 disable_image_load=True):
         """
         Initialize the InstaPyIntegration with the necessary credentials and settings.
 
@@ -29,16 +50,40 @@ class InstaPyIntegration:
             headless_browser (bool): Whether to run the browser in headless mode.
             proxy_address (str): Proxy address for the session.
             proxy_port (str): Proxy port for the session.
+            disable_image_load (bool): Whether the browser skips loading images. The bot only
+                interacts with posts, so images are pure overhead by default.
         """
         self.username = username
         self.password = password
         self.headless_browser = headless_browser
         self.proxy_address = proxy_address
         self.proxy_port = proxy_port
+        self.disable_image_load = disable_image_load
         self.logger = logging.getLogger(__name__)
         self.logger.info("InstaPyIntegration initialized with provided credentials and settings.")
         self.session = None
-        self.instagram_api = InstagramIntegration(access_token)
+        # InstagramIntegration reads its credentials through a config_manager-style `get`.
+        self.instagram_api = InstagramIntegration({"instagram_access_token": access_token})
+        self._pending_comments = []
+        self._pending_lock = threading.Lock()
+        # Limits are per account, so every integration for the same user shares one budget.
+        with self._limiters_lock:
+            self.limiter = self._limiters.setdefault(
+                username, SlidingWindowLimiter(self.RATE_LIMIT_CALLS, self.RATE_LIMIT_PERIOD)
+            )
+
+    def _acquire(self, actions):
+        """
+        Take one call from the account's rate limit budget per action a method performs.
+
+        A single InstaPy call can like or follow `amount` times, and a batch posts one comment
+        per item, so each of those counts against the hourly budget rather than the call itself.
+
+        Args:
+            actions (int): The number of actions about to be performed.
+        """
+        for _ in range(actions):
+            self.limiter.acquire()
 
     def start_session(self):
         """
@@ -53,7 +98,8 @@ class InstaPyIntegration:
                 password=self.password,
                 headless_browser=self.headless_browser,
                 proxy_address=self.proxy_address,
-                proxy_port=self.proxy_port
+                proxy_port=self.proxy_port,
+                disable_image_load=self.disable_image_load
             )
             self.session.login()
             self.logger.info("InstaPy session started successfully.")
@@ -83,6 +129,7 @@ class InstaPyIntegration:
 
         posts = []
         try:
+            self._acquire(amount)
             self.session.like_by_tags([hashtag], amount=amount, skip_top_posts=skip_top_posts, interact=interact)
             self.logger.info(f"Interacted with {amount} posts for hashtag: {hashtag}")
             posts = [{"hashtag": hashtag, "post_id": i, "interacted": True} for i in range(amount)]
@@ -129,6 +176,7 @@ class InstaPyIntegration:
             Exception: If the comment fails to post.
         """
         try:
+            self.limiter.acquire()
             result = self.instagram_api.post_comment(media_id, comment_text)
             self.logger.info(f"Comment posted successfully on media ID {media_id}.")
             return result
@@ -136,6 +184,66 @@ class InstaPyIntegration:
             self.logger.error(f"Failed to post comment on media ID {media_id}: {e}")
             raise
 
+    def queue_comment(self, media_id, comment_text):
+        """
+        Queue a comment to be posted with the next batch instead of immediately.
+
+        The queue is flushed automatically once COMMENT_BATCH_SIZE comments are pending.
+
+        Args:
+            media_id (str): The ID of the media to comment on.
+            comment_text (str): The text of the comment.
+
+        Returns:
+            list: The results of the flushed batch if this comment triggered a flush, otherwise an empty list.
+        """
+        with self._pending_lock:
+            self._pending_comments.append((media_id, comment_text))
+            full = len(self._pending_comments) >= self.COMMENT_BATCH_SIZE
+        return self.flush_comments() if full else []
+
+    def flush_comments(self):
+        """
+        Post all queued comments using Graph API batch requests.
+
+        Comments that fail are queued again, ahead of any queued since, for the next flush.
+
+        Returns:
+            list: The result of each queued comment, or None for failed ones, in queue order.
+
+        Raises:
+            Exception: If the batch request can't be sent; every comment is queued again.
+        """
+        with self._pending_lock:
+            pending, self._pending_comments = self._pending_comments, []
+        if not pending:
+            return []
+
+        try:
+            self._acquire(len(pending))
+            results = self.instagram_api.reply_to_posts_batch(pending)
+        except Exception as e:
+            self._requeue_comments(pending)
+            self.logger.error(f"Failed to flush {len(pending)} queued comments, queued them again: {e}")
+            raise
+
+        failed = [comment for comment, result in zip(pending, results) if result is None]
+        if failed:
+            self._requeue_comments(failed)
+            self.logger.warning(f"{len(failed)} of {len(pending)} queued comments failed and were queued again.")
+        self.logger.info(f"Flushed {len(pending) - len(failed)} queued comments.")
+        return results
+
+    def _requeue_comments(self, comments):
+        """
+        Put comments that failed to post back at the front of the queue.
+
+        Args:
+            comments (list): The (media_id, comment_text) tuples to queue again, in queue order.
+        """
+        with self._pending_lock:
+            self._pending_comments[:0] = comments
+
     def reply_to_comment(self, comment_id, reply_text):
         """
         Reply to a comment on a specific Instagram media (post).
@@ -151,6 +259,7 @@ class InstaPyIntegration:
             Exception: If the reply fails to post.
         """
         try:
+            self.limiter.acquire()
             result = self.instagram_api.reply_to_comment(comment_id, reply_text)
             self.logger.info(f"Reply posted successfully to comment ID {comment_id}.")
             return result
@@ -178,6 +287,7 @@ class InstaPyIntegration:
 
         tags = tags or ["nature", "travel"]
         try:
+            self._acquire(amount)
             self.session.follow_by_tags(tags, amount=amount)
             result = {"followed_users": amount, "tags": tags, "status": "followed"}
             self.logger.info(f"Followed {amount} users using tags: {tags}")
@@ -204,6 +314,7 @@ class InstaPyIntegration:
             raise Exception("Session not started")
 
         try:
+            self._acquire(amount)
             self.session.unfollow_users(amount=amount, nonFollowers=True, style="RANDOM")
             result = {"unfollowed_users": amount, "status": "unfollowed"}
             self.logger.info(f"Unfollowed {amount} users.")
@@ -219,8 +330,104 @@ class InstaPyIntegration:
         Raises:
             Warning: If no session is active.
         """
-        if self.session:
-            self.session.end()
-            self.logger.info("InstaPy session ended successfully.")
-        else:
-            self.logger.warning("No active session to end.")
+        try:
+            if self._pending_comments:
+                self.flush_comments()
+        finally:
+            if self.session:
+                self.session.end()
+                self.logger.info("InstaPy session ended successfully.")
+            else:
+                self.logger.warning("No active session to end.")
+
+
+class InstaPyAccountPool:
+    """
+    InstaPyAccountPool owns one pre-started InstaPyIntegration per account and spreads
+    browser-driven work across them, so throughput scales with the number of accounts.
+
+    Each integration drives its own Selenium browser and is only ever used by one thread at a time.
+    """
+
+    def __init__(self, accounts, access_token, headless_browser=True):
+        """
+        Initialize the pool with one InstaPyIntegration per account.
+
+        Args:
+            accounts (list): Dictionaries with `username`, `password` and optional `proxy_address`/`proxy_port`.
+            access_token (str): Instagram API access token shared by the integrations.
+            headless_browser (bool): Whether to run the browsers in headless mode.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.integrations = [
+            InstaPyIntegration(access_token=access_token, headless_browser=headless_browser, **account)
+            for account in accounts
+        ]
+        self._available = queue.Queue()
+        self._started = False
+        self.logger.info(f"InstaPyAccountPool initialized with {len(self.integrations)} accounts.")
+
+    def start(self):
+        """
+        Start every session in the pool and make it available to workers.
+
+        Browser start-up dominates the cost of a session, so the browsers are booted in parallel.
+
+        Raises:
+            Exception: If a session fails to start.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.integrations) or 1) as executor:
+            futures = [executor.submit(integration.start_session) for integration in self.integrations]
+        for integration, future in zip(self.integrations, futures):
+            future.result()
+            self._available.put(integration)
+        self._started = True
+
+    def run(self, method_name, *args, **kwargs):
+        """
+        Run an InstaPyIntegration method on the next free account, blocking until one is available.
+
+        Args:
+            method_name (str): The name of the InstaPyIntegration method to call.
+
+        Returns:
+            The result of the method call.
+
+        Raises:
+            Exception: If the pool was not started or has no accounts, since no account would ever become free.
+        """
+        if not self._started or not self.integrations:
+            self.logger.error("Account pool not started or empty. Call start() first.")
+            raise Exception("Account pool not started")
+        integration = self._available.get()
+        try:
+            return getattr(integration, method_name)(*args, **kwargs)
+        finally:
+            self._available.put(integration)
+
+    def get_posts_bulk(self, hashtags, amount=10, skip_top_posts=True, interact=False):
+        """
+        Interact with posts for several hashtags, one account per hashtag in parallel.
+
+        Args:
+            hashtags (list): The hashtags to search for posts.
+            amount (int): The number of posts to interact with per hashtag.
+            skip_top_posts (bool): Whether to skip the top posts.
+            interact (bool): Whether to interact with the posts.
+
+        Returns:
+            dict: A mapping of each hashtag to its list of posts.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.integrations) or 1) as executor:
+            results = executor.map(
+                lambda hashtag: self.run("get_posts", hashtag, amount=amount, skip_top_posts=skip_top_posts, interact=interact),
+                hashtags
+            )
+            return dict(zip(hashtags, results))
+
+    def end(self):
+        """
+        End every session in the pool.
+        """
+        for integration in self.integrations:
+            integration.end_session()
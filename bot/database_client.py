@@ -22,34 +22,45 @@ class DatabaseClient:
         self.logger = logging.getLogger(__name__)
         self.supabase_url = config_manager.get("supabase_url")
         self.supabase_key = config_manager.get("supabase_key")
-
-        try:
-            self.client: Client = create_client(self.supabase_url, self.supabase_key)
-            self.logger.info("Supabase client initialized successfully.")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Supabase client: {e}")
-            raise
+        self._client = None
+        self._client_lock = threading.Lock()
 
         self._initialized = True
 
+    @property
+    def client(self) -> Client:
+        """The Supabase client, created on first database access rather than at startup."""
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        self._client = create_client(self.supabase_url, self.supabase_key)
+                        self.logger.info("Supabase client initialized successfully.")
+                    except Exception as e:
+                        self.logger.error(f"Failed to initialize Supabase client: {e}")
+                        raise
+                client = self._client
+        return client
+
     def check_table_exists(self, table_name):
         """Check if the table exists by querying it, even if it has no entries."""
         try:
             response = self.client.table(table_name).select("*").limit(1).execute()
 
             # Log the raw response for debugging purposes
-            self.logger.debug(f"Raw response from Supabase for table '{table_name}': {response}")
+            self.logger.debug("Raw response from Supabase for table '%s': %s", table_name, response)
 
             # Check if the response has data or is an empty list (which is valid if the table is empty)
             if response.data is not None:
-                self.logger.info(f"Table '{table_name}' exists and is accessible.")
+                self.logger.info("Table '%s' exists and is accessible.", table_name)
                 return True
             else:
-                self.logger.warning(f"Table '{table_name}' might exist but is empty or cannot be accessed.")
+                self.logger.warning("Table '%s' might exist but is empty or cannot be accessed.", table_name)
                 return True  # Assume the table exists even if it has no data
 
         except APIError as e:
-            self.logger.error(f"Error checking table existence: {e}")
+            self.logger.error("Error checking table existence: %s", e)
             return False
 
     def add_caption(self, caption_data):
@@ -151,24 +162,41 @@ class DatabaseClient:
         try:
             response = self.client.from_("user_preferences").select("*").eq("user_id", user_id).execute()
             if response.data:
-                self.logger.info(f"User preferences retrieved for user_id: {user_id}")
+                self.logger.info("User preferences retrieved for user_id: %s", user_id)
                 return response.data
             else:
-                self.logger.warning(f"No user preferences found for user_id: {user_id}")
+                self.logger.warning("No user preferences found for user_id: %s", user_id)
                 return None
         except Exception as e:
-            self.logger.error(f"Error retrieving user preferences for user_id {user_id}: {e}")
+            self.logger.error("Error retrieving user preferences for user_id %s: %s", user_id, e)
             return None
 
+    def get_user_preferences_bulk(self, user_ids):
+        """
+        Retrieve the preferences of several users in a single query.
+
+        :param user_ids: The IDs of the users to retrieve preferences for.
+        :return: A dictionary mapping each found user ID to its preferences row.
+        :raises Exception: If the query fails, so a failed lookup isn't mistaken for users without preferences.
+        """
+        try:
+            response = self.client.from_("user_preferences").select("*").in_("user_id", list(user_ids)).execute()
+        except Exception as e:
+            self.logger.error("Error retrieving user preferences for %s users: %s", len(user_ids), e)
+            raise
+        rows = {row["user_id"]: row for row in response.data or []}
+        self.logger.info("User preferences retrieved for %s of %s users", len(rows), len(user_ids))
+        return rows
+
     def update_user_preferences(self, user_id, preferences):
         try:
             response = self.client.from_("user_preferences").upsert({"user_id": user_id, **preferences}).execute()
             if response.data:
-                self.logger.info(f"Preferences for user {user_id} updated successfully")
+                self.logger.info("Preferences for user %s updated successfully", user_id)
             else:
-                self.logger.error(f"Failed to update preferences for user {user_id}: {response}")
+                self.logger.error("Failed to update preferences for user %s: %s", user_id, response)
         except Exception as e:
-            self.logger.error(f"Failed to update preferences for user {user_id}: {e}")
+            self.logger.error("Failed to update preferences for user %s: %s", user_id, e)
 
     def get_data(self, table_name, filters=None):
         """
@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import json
 import os
 import logging
@@ -186,30 +187,37 @@ if __name__ == "__main__":
     config_manager = ConfigManager()
     database_client = DatabaseClient(config_manager)
     user_preferences = UserPreferences(config_manager, database_client, 1)
+    prewarm_user_ids = config_manager.get("prewarm_user_ids", [])
+    if prewarm_user_ids:
+        user_preferences.prewarm(prewarm_user_ids)
     openai_client = OpenAIClient(config_manager, user_preferences)
     interactive_mode = args.interactive
     bot = SocialBot(config_manager, openai_client, database_client, user_preferences, interactive_mode)
 
-    if args.action == "create_post":
-        if not args.platform:
-            raise ValueError("Platform must be specified for creating a post.")
-        create_post(bot, args.platform, bot.logger, args.delay_post)
+    try:
+        if args.action == "create_post":
+            if not args.platform:
+                raise ValueError("Platform must be specified for creating a post.")
+            create_post(bot, args.platform, bot.logger, args.delay_post)
     
-    elif args.action == "comment_to_post":
-        if not args.platform or not args.media_id or not args.comment_text:
-            raise ValueError("Platform and media_id must be specified for commenting on a post.")
-        comment_to_post(bot, args.platform, args.media_id, bot.logger)
+        elif args.action == "comment_to_post":
+            if not args.platform or not args.media_id or not args.comment_text:
+                raise ValueError("Platform and media_id must be specified for commenting on a post.")
+            comment_to_post(bot, args.platform, args.media_id, bot.logger)
     
-    elif args.action == "reply_to_comments":
-        if not args.platform or not args.media_id or not args.reply_text:
-            raise ValueError("Platform and media_id must be specified for replying to a comments.")
-        reply_to_comments(bot, args.platform, args.media_id, bot.logger)
+        elif args.action == "reply_to_comments":
+            if not args.platform or not args.media_id or not args.reply_text:
+                raise ValueError("Platform and media_id must be specified for replying to a comments.")
+            reply_to_comments(bot, args.platform, args.media_id, bot.logger)
     
-    elif args.action == "add_caption":
-        if args.file:
-            add_caption_from_file(database_client, args.file)
-        else:
-            add_caption_interactive(database_client)
+        elif args.action == "add_caption":
+            if args.file:
+                add_caption_from_file(database_client, args.file)
+            else:
+                add_caption_interactive(database_client)
     
-    else:
-        raise ValueError(f"Unknown action: {args.action}")
+        else:
+            raise ValueError(f"Unknown action: {args.action}")
+    finally:
+        # Release the async OpenAI client's pooled connections before the interpreter exits.
+        asyncio.run(openai_client.aclose())
@@ -1,6 +1,8 @@
 import os
+import asyncio
+import httpx
 import openai
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import logging
 from user_preferences import UserPreferences
 from config_manager import ConfigManager
@@ -18,6 +20,13 @@ class OpenAIClient:
             raise ValueError("API key not found. Please ensure it is set in the environment or .env file.")
 
         self.client = OpenAI(api_key=self.api_key)
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=30.0
+            )
+        )
         self.model = config_manager.get("openai_engine", "gpt-3.5-turbo")
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"OpenAIClient initialized with API key: {self.api_key[:5]}...")
@@ -47,6 +56,55 @@ class OpenAIClient:
 
         raise Exception("Max retries exceeded. Failed to generate completion.")
 
+    async def astream_complete(self, prompt, max_tokens=150, temperature=0.7, retries=3):
+        """
+        Stream a completion from the async OpenAI client, yielding text as it arrives.
+
+        A timeout or connection error is retried as long as no text has been yielded yet;
+        after that, retrying would repeat text the caller already has, so the error is raised.
+
+        :param prompt: The prompt to complete.
+        :param max_tokens: The maximum number of tokens to generate.
+        :param temperature: The sampling temperature.
+        :param retries: The number of times to try the request in case of a transient error.
+        :return: An async iterator over the completion text chunks.
+        :raises Exception: If the completion fails after all retries.
+        """
+        self.logger.info(f"Streaming completion for prompt: {prompt[:50]}...")
+
+        for attempt in range(retries):
+            yielded = False
+            try:
+                stream = await self.async_client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yielded = True
+                        yield chunk.choices[0].delta.content
+                return
+            except (openai.APITimeoutError, openai.APIConnectionError) as e:
+                if yielded:
+                    self.logger.error(f"Completion stream interrupted: {e}")
+                    raise
+                self.logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying...")
+                await asyncio.sleep(2)
+            except Exception as e:
+                self.logger.error(f"Failed to generate completion: {e}")
+                raise
+
+        raise Exception("Max retries exceeded. Failed to generate completion.")
+
+    async def aclose(self):
+        """
+        Close the pooled connections held by the async OpenAI client.
+        """
+        await self.async_client.close()
+
     def generate_image(self, caption, n=1, size="1024x1024", retries=3, timeout=30):
         """
         Generate an image based on the provided caption using DALL-E via OpenAI API and save it locally.
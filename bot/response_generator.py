@@ -1,4 +1,8 @@
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from openai_client import OpenAIClient
 from database_client import DatabaseClient
 from user_preferences import UserPreferences
@@ -11,6 +15,13 @@ class ResponseGenerator:
     uses DALL-E for image generation, and considers user preferences for personalized content.
     """
 
+    __slots__ = ("openai_client", "database_client", "user_preferences", "logger", "_image_suffix", "_image_cache")
+
+    # DALL-E image URLs expire about an hour after generation, so cached ones are dropped well before that.
+    IMAGE_CACHE_TTL = 45 * 60
+    # How many generated image URLs are kept; the least recently used is evicted beyond that.
+    IMAGE_CACHE_SIZE = 128
+
     def __init__(self, openai_client: OpenAIClient, database_client: DatabaseClient, user_preferences: UserPreferences):
         """
         Initialize the ResponseGenerator with the necessary clients and preferences.
@@ -25,6 +36,13 @@ class ResponseGenerator:
         self.user_preferences = user_preferences
         self.logger = logging.getLogger(__name__)
 
+        # Image prompt suffix derived from the style preferences, built lazily and
+        # reset whenever the user preferences are replaced.
+        self._image_suffix = None
+        # (image URL, generated at) keyed by the SHA-256 of the full image prompt, in least-recently-used order.
+        self._image_cache = OrderedDict()
+        self.user_preferences.register_update_callback(self._invalidate_image_suffix)
+
     def generate_caption(self, caption_text=None):
         """
         Retrieve and personalize a caption from the database for a new Instagram post,
@@ -69,21 +87,61 @@ class ResponseGenerator:
             Exception: If the image generation fails.
         """
         try:
-            preferences = self.user_preferences.get_preferences()  # Ensuring consistency in accessing preferences
-            modified_caption = f"{caption} with elements such as {preferences.get('style', None)} style, {preferences.get('color_scheme', None)} color scheme."
+            modified_caption = caption + self._ensure_image_suffix()
+            cache_key = hashlib.sha256(modified_caption.encode()).hexdigest()
+            cached = self._image_cache.get(cache_key)
+            if cached:
+                image_url, generated_at = cached
+                if time.monotonic() - generated_at < self.IMAGE_CACHE_TTL:
+                    self._image_cache.move_to_end(cache_key)
+                    self.logger.info(f"Reusing cached image URL: {image_url}")
+                    return image_url
+                self._image_cache.pop(cache_key, None)
+
             image_url = self.openai_client.generate_image(modified_caption)
+            self._image_cache[cache_key] = (image_url, time.monotonic())
+            if len(self._image_cache) > self.IMAGE_CACHE_SIZE:
+                self._image_cache.popitem(last=False)
             self.logger.info(f"Generated image URL: {image_url}")
             return image_url
         except Exception as e:
             self.logger.error(f"Error in generating image: {e}")
             raise Exception(f"Image generation failed: {e}")
 
-    async def generate_personalized_comment(self, context=None):
+    def _ensure_image_suffix(self):
+        """
+        Build the image prompt suffix from the user's style preferences, once. Preferences
+        that aren't set are left out, rather than asking for a "None style".
+
+        Returns:
+            str: The suffix appended to captions before image generation.
+        """
+        if self._image_suffix is None:
+            preferences = self.user_preferences.get_preferences()  # Ensuring consistency in accessing preferences
+            elements = []
+            if preferences.get('style'):
+                elements.append(f"{preferences['style']} style")
+            if preferences.get('color_scheme'):
+                elements.append(f"{preferences['color_scheme']} color scheme")
+            self._image_suffix = f" with elements such as {', '.join(elements)}." if elements else ""
+        return self._image_suffix
+
+    def _invalidate_image_suffix(self, preferences=None):
+        """
+        Drop the cached image prompt suffix so it is rebuilt from the new preferences.
+
+        Args:
+            preferences (dict): The new preferences (unused).
+        """
+        self._image_suffix = None
+
+    async def generate_personalized_comment(self, context=None, *, on_chunk=None):
         """
         Generate a personalized comment for an Instagram post based on the provided context.
 
         Args:
             context (str): Optional context to guide the comment generation.
+            on_chunk (callable): Optional callback receiving the comment text as it streams in.
 
         Returns:
             str: A generated personalized comment.
@@ -97,19 +155,20 @@ class ResponseGenerator:
             interaction_type = self.user_preferences.comment_interaction_type
             
             prompt = f"Generate a comment in a {response_style} style with a {content_tone} tone that aligns with {interaction_type} interactions. Context: {context}"
-            personalized_comment = await self.openai_client.complete(prompt)
+            personalized_comment = await self._stream_completion(prompt, on_chunk)
             self.logger.info(f"Generated personalized comment: {personalized_comment}")
             return personalized_comment
         except Exception as e:
             self.logger.error(f"Error in generating personalized comment: {e}")
             raise Exception(f"Error generating personalized comment: {e}")
 
-    async def generate_personalized_reply(self, context=None):
+    async def generate_personalized_reply(self, context=None, *, on_chunk=None):
         """
         Generate a personalized reply to a comment on an Instagram post based on the provided context.
 
         Args:
             context (str): Optional context to guide the reply generation.
+            on_chunk (callable): Optional callback receiving the reply text as it streams in.
 
         Returns:
             str: A generated personalized reply.
@@ -123,13 +182,31 @@ class ResponseGenerator:
             interaction_type = self.user_preferences.reply_interaction_type
             
             prompt = f"Generate a reply in a {response_style} style with a {content_tone} tone that aligns with {interaction_type} interactions. Context: {context}"
-            personalized_reply = await self.openai_client.complete(prompt)
+            personalized_reply = await self._stream_completion(prompt, on_chunk)
             self.logger.info(f"Generated personalized reply: {personalized_reply}")
             return personalized_reply
         except Exception as e:
             self.logger.error(f"Error in generating personalized reply: {e}")
             raise Exception(f"Error generating personalized reply: {e}")
 
+    async def _stream_completion(self, prompt, on_chunk=None):
+        """
+        Stream a completion, handing each chunk to the optional callback as it arrives.
+
+        Args:
+            prompt (str): The prompt to complete.
+            on_chunk (callable): Optional callback receiving each text chunk.
+
+        Returns:
+            str: The full completion text.
+        """
+        chunks = []
+        async for chunk in self.openai_client.astream_complete(prompt):
+            chunks.append(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+        return "".join(chunks).strip()
+
     async def generate_all_content_for_post(self, context=None):
         """
         Generate all necessary content (caption, image, comment, and reply) for a post.
@@ -144,10 +221,13 @@ class ResponseGenerator:
             Exception: If any part of the content generation process fails.
         """
         try:
-            caption = self.generate_caption()
-            image_url = self.generate_image(caption)
-            comment = await self.generate_personalized_comment(context)
-            reply = await self.generate_personalized_reply(context)
+            # The caption and image are generated in a worker thread while the comment
+            # and reply stream in, so the requests to OpenAI overlap.
+            (caption, image_url), comment, reply = await asyncio.gather(
+                asyncio.to_thread(self._generate_caption_and_image),
+                self.generate_personalized_comment(context),
+                self.generate_personalized_reply(context)
+            )
 
             self.logger.info("Successfully generated all content for the post.")
             return {
@@ -159,3 +239,13 @@ class ResponseGenerator:
         except Exception as e:
             self.logger.error(f"Error generating content for post: {e}")
             raise Exception(f"Error generating content for post: {e}")
+
+    def _generate_caption_and_image(self):
+        """
+        Generate a caption and the image based on it.
+
+        Returns:
+            tuple: The generated caption and image URL.
+        """
+        caption = self.generate_caption()
+        return caption, self.generate_image(caption)
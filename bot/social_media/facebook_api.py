@@ -1,5 +1,7 @@
 import requests
 import logging
+import time
+import orjson
 from social_media.social_media_base import SocialMediaIntegration
 
 class FacebookIntegration(SocialMediaIntegration):
@@ -40,14 +42,18 @@ class FacebookIntegration(SocialMediaIntegration):
 
         attempt = 0
         while attempt < retries:
+            response = None
             try:
                 response = self.session.get(url, params=params)
                 response.raise_for_status()
-                posts = response.json().get('data', [])
+                posts = orjson.loads(response.content).get('data', [])
                 self.logger.info(f"Retrieved {len(posts)} posts for hashtag: #{hashtag}")
                 return posts
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # No response to inspect; the connection can be retried right away.
+                self.logger.warning(f"Connection error fetching posts for hashtag #{hashtag}: {e}. Retrying. Attempt {attempt + 1}")
             except requests.exceptions.RequestException as e:
-                if response.status_code == 429:
+                if response is not None and response.status_code == 429:
                     self.logger.warning(f"Rate limit exceeded. Retrying after delay. Attempt {attempt + 1}")
                     time.sleep(2 ** attempt * backoff_factor)
                 else:
@@ -74,7 +80,7 @@ class FacebookIntegration(SocialMediaIntegration):
         try:
             response = self.session.post(url, data=data)
             response.raise_for_status()
-            post_id = response.json().get('id')
+            post_id = orjson.loads(response.content).get('id')
             post_url = f"https://www.facebook.com/{self.page_id}/posts/{post_id}"
             self.logger.info(f"Image posted successfully: {post_url}")
             return {"status": "success", "url": post_url}
@@ -96,7 +102,7 @@ class FacebookIntegration(SocialMediaIntegration):
         try:
             response = self.session.post(url, data=data)
             response.raise_for_status()
-            comment_id = response.json().get('id')
+            comment_id = orjson.loads(response.content).get('id')
             self.logger.info(f"Comment posted on post ID {media_id}.")
             return {"status": "success", "comment_id": comment_id}
         except requests.exceptions.RequestException as e:
@@ -117,7 +123,7 @@ class FacebookIntegration(SocialMediaIntegration):
         try:
             response = self.session.post(url, data=data)
             response.raise_for_status()
-            reply_id = response.json().get('id')
+            reply_id = orjson.loads(response.content).get('id')
             self.logger.info(f"Reply posted to comment ID {comment_id}.")
             return {"status": "success", "reply_id": reply_id}
         except requests.exceptions.RequestException as e:
@@ -165,7 +171,7 @@ class FacebookIntegration(SocialMediaIntegration):
 
             response = self.session.get(url, params=params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             post_content = {
                 'text': data.get('message', ''),
@@ -194,7 +200,7 @@ class FacebookIntegration(SocialMediaIntegration):
 
             response = self.session.get(url, params=params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             comments_list = [{'id': comment.get('id'), 'text': comment.get('message')} for comment in data.get('data', [])]
 
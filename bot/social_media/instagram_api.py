@@ -1,7 +1,37 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import logging
-import time
+import threading
+import orjson
+from collections import OrderedDict
+from urllib.parse import quote_plus
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from social_media.social_media_base import SocialMediaIntegration
+from social_media.rate_limiter import TokenBucket
+
+# Shared across all InstagramIntegration instances so keep-alive connections to the API
+# hosts are reused. Credentials are sent per request since instances may use different tokens.
+# Only idempotent reads are retried by the transport: resending a POST after a 5xx or a read
+# error could publish the same post or comment twice, so writes are left to the caller.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['GET', 'HEAD']),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=128, max_retries=_RETRY))
+# urllib3 only decodes Brotli when the brotli package is installed, so advertise it explicitly.
+_SESSION.headers.update({'Accept-Encoding': 'gzip, br'})
+
+# Worker threads for the async wrappers around the blocking request methods. Sized to the
+# number of concurrent connections Instagram tolerates per host rather than to the CPU count.
+_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ig-io")
 
 class InstagramIntegration(SocialMediaIntegration):
     """
@@ -9,6 +39,14 @@ class InstagramIntegration(SocialMediaIntegration):
     allowing operations such as retrieving posts, posting comments, and replying to comments.
     """
 
+    MAX_CONCURRENT_REQUESTS = 64  # Cap on in-flight requests for the bulk helpers
+    RATE_LIMIT_BURST = 10  # Requests allowed back-to-back before the limiter paces calls
+    RATE_LIMIT_PER_SECOND = 5.0  # Sustained request rate while the app usage quota is unused
+    FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+    BATCH_SIZE = 50  # Maximum number of sub-requests the Graph API accepts in one batch call
+    FIELDS = "id,caption,media_url,timestamp,permalink"  # Post fields requested from the Graph API
+    ETAG_CACHE_SIZE = 256  # Hashtag searches kept for If-None-Match revalidation, least recently used evicted
+
     def __init__(self, config_manager, use_graph_api=True):
         """
         Initialize the InstagramIntegration with API credentials and settings.
@@ -21,37 +59,162 @@ class InstagramIntegration(SocialMediaIntegration):
         self.api_key = config_manager.get("instagram_api_key")
         self.access_token = config_manager.get("instagram_access_token") if use_graph_api else None
         self.base_url = "https://graph.instagram.com/" if use_graph_api else "https://api.instagram.com/v1"
-        self.session = requests.Session()
+        self.session = _SESSION
 
         if not use_graph_api:
-            self.session.headers.update({'Authorization': f'Bearer {self.api_key}'})
+            self.headers = {'Authorization': f'Bearer {self.api_key}'}
+        else:
+            self.headers = {'Authorization': f'Bearer {self.access_token}'}
+
+        # URL templates and auth parameters are fixed for the API flavor, so they are built once.
+        if use_graph_api:
+            self._posts_url_template = self.base_url + "{0}/recent_media"
+            self._media_url_template = self.base_url + "{0}"
+            self._comments_url_template = self.base_url + "{0}/comments"
+            self._replies_url_template = self.base_url + "{0}/replies"
+            self._auth_params = {'access_token': self.access_token}
+            self._text_field = "message"
+            self._auth_query = "&access_token=" + quote_plus(self.access_token or "")
         else:
-            self.session.headers.update({'Authorization': f'Bearer {self.access_token}'})
+            self._posts_url_template = self.base_url + "/tags/{0}/media/recent"
+            self._media_url_template = self.base_url + "/media/{0}"
+            self._comments_url_template = self.base_url + "/media/{0}/comments"
+            self._replies_url_template = self.base_url + "/media/{0}/comments"
+            self._auth_params = None
+            self._text_field = "text"
+            self._auth_query = ""
+
+        self.limiter = TokenBucket(self.RATE_LIMIT_BURST, self.RATE_LIMIT_PER_SECOND)
+
+        # The user ID and hashtag IDs are stable for a token, so they are looked up once.
+        self._user_id = None
+        self._hashtag_cache = {}
+
+        # Hashtag lookups in flight; concurrent callers for the same hashtag wait on the first one.
+        self._inflight_lock = threading.Lock()
+        self._inflight_hashtags = {}
+
+        # Last ETag and posts per hashtag and field set, used to revalidate get_posts with If-None-Match.
+        self._etag_cache = OrderedDict()
+        self._etag_lock = threading.Lock()
 
         self.logger = logging.getLogger(__name__)
         self.logger.info("InstagramIntegration initialized with provided API key and access token.")
 
-    def get_posts(self, hashtag, retries=3, backoff_factor=0.3):
+    def get_posts(self, hashtag, fields=None):
         """
-        Retrieve posts associated with a specific hashtag, with retry logic for handling failures.
+        Retrieve posts associated with a specific hashtag.
+
+        Rate-limited and transient server errors are retried by the shared session's adapter
+        with exponential backoff, so there are no per-call retry settings.
 
         :param hashtag: The hashtag to search for posts.
-        :param retries: Number of retries in case of failures.
-        :param backoff_factor: Factor for increasing delay between retries.
+        :param fields: Comma-separated post fields to request, defaulting to FIELDS.
+                       Only honored by the Graph API; the Basic Display API returns full records.
         :return: A list of posts associated with the hashtag.
+        :raises ValueError: If the hashtag is empty.
         """
+        if not hashtag:
+            raise ValueError("A hashtag is required to retrieve posts.")
+        fields = fields or self.FIELDS
         if self.use_graph_api:
             hashtag_id = self._get_hashtag_id(hashtag)
             if not hashtag_id:
                 return []
-            url = f"{self.base_url}{hashtag_id}/recent_media"
-            params = {'user_id': self._get_user_id(), 'access_token': self.access_token}
+            url = self._posts_url_template.format(hashtag_id)
+            params = {'user_id': self._get_user_id(), 'fields': fields, **self._auth_params}
         else:
-            url = f"{self.base_url}/tags/{hashtag}/media/recent"
+            url = self._posts_url_template.format(hashtag)
             params = None
 
-        self.logger.info(f"Fetching posts for hashtag: {hashtag}")
-        return self._execute_get_request(url, params, retries, backoff_factor)
+        self.logger.info("Fetching posts for hashtag: %s", hashtag)
+        cache_key = (hashtag, fields)
+        with self._etag_lock:
+            etag, cached_posts = self._etag_cache.get(cache_key, (None, None))
+        response = self._send('GET', url, headers={'If-None-Match': etag} if etag else None, params=params)
+        if response is None:
+            return []
+        if response.status_code == 304 and cached_posts is not None:
+            self.logger.info("Posts for hashtag %s not modified, using cached posts.", hashtag)
+            with self._etag_lock:
+                if cache_key in self._etag_cache:
+                    self._etag_cache.move_to_end(cache_key)
+            # Each caller gets its own list, so one caller's changes don't leak into the cache.
+            return list(cached_posts)
+        self.logger.debug("Posts response for hashtag %s encoded as %s", hashtag, response.headers.get('Content-Encoding'))
+
+        try:
+            posts = orjson.loads(response.content).get('data', [])
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Invalid JSON in posts response for hashtag %s: %s", hashtag, e)
+            return []
+        new_etag = response.headers.get('ETag')
+        if new_etag:
+            with self._etag_lock:
+                self._etag_cache[cache_key] = (new_etag, list(posts))
+                self._etag_cache.move_to_end(cache_key)
+                if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return posts
+
+    async def get_posts_bulk(self, hashtags):
+        """
+        Retrieve posts for several hashtags concurrently.
+
+        Each hashtag is fetched on the shared worker pool so the network waits overlap, with at
+        most MAX_CONCURRENT_REQUESTS requests in flight at once.
+
+        :param hashtags: The hashtags to search for posts.
+        :return: A dictionary mapping each hashtag to its list of posts.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(hashtag):
+            async with semaphore:
+                return await self.aget_posts(hashtag)
+
+        results = await asyncio.gather(*(fetch(hashtag) for hashtag in hashtags))
+        return dict(zip(hashtags, results))
+
+    async def aget_posts(self, hashtag, fields=None):
+        """
+        Retrieve posts for a hashtag without blocking the event loop.
+
+        :param hashtag: The hashtag to search for posts.
+        :param fields: Comma-separated post fields to request, defaulting to FIELDS.
+        :return: A list of posts associated with the hashtag.
+        """
+        return await self._run_in_pool(self.get_posts, hashtag, fields=fields)
+
+    async def apost_comment(self, media_id, comment_text):
+        """
+        Post a comment on a media without blocking the event loop.
+
+        :param media_id: The ID of the media (post) to comment on.
+        :param comment_text: The text of the comment to post.
+        :return: The result of the comment operation.
+        """
+        return await self._run_in_pool(self.post_comment, media_id, comment_text)
+
+    async def areply_to_comment(self, comment_id, reply_text):
+        """
+        Reply to a comment without blocking the event loop.
+
+        :param comment_id: The ID of the comment to reply to.
+        :param reply_text: The text of the reply.
+        :return: The result of the reply operation.
+        """
+        return await self._run_in_pool(self.reply_to_comment, comment_id, reply_text)
+
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """
+        Run a blocking method on the shared Instagram worker pool.
+
+        :param func: The blocking callable to run.
+        :return: The callable's return value.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_POOL, functools.partial(func, *args, **kwargs))
 
     def fetch_post_content(self, media_id):
         """
@@ -64,29 +227,24 @@ class InstagramIntegration(SocialMediaIntegration):
             dict: The content of the post.
         """
         try:
+            url = self._media_url_template.format(media_id)
+            response = self._request('GET', url, params=self._auth_params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
             if self.use_graph_api:
-                url = f"{self.base_url}{media_id}"
-                params = {'access_token': self.access_token}
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
                 post_content = {
                     'text': data.get('caption', {}).get('text', ''),
                     'media_url': data.get('media_url', '')
                 }
             else:
-                url = f"{self.base_url}/media/{media_id}"
-                response = self.session.get(url)
-                response.raise_for_status()
-                data = response.json()
                 post_content = {
                     'text': data.get('caption', ''),
                     'media_url': data.get('images', {}).get('standard_resolution', {}).get('url', '')
                 }
-            self.logger.info(f"Fetched content for post {media_id} on Instagram.")
+            self.logger.info("Fetched content for post %s on Instagram.", media_id)
             return post_content
         except Exception as e:
-            self.logger.error(f"Failed to fetch post content for {media_id} on Instagram: {e}", exc_info=True)
+            self.logger.error("Failed to fetch post content for %s on Instagram: %s", media_id, e, exc_info=True)
             raise
 
     def fetch_comments_list(self, media_id):
@@ -100,21 +258,15 @@ class InstagramIntegration(SocialMediaIntegration):
             list: A list of comments on the post.
         """
         try:
-            if self.use_graph_api:
-                url = f"{self.base_url}{media_id}/comments"
-                params = {'access_token': self.access_token}
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-            else:
-                url = f"{self.base_url}/media/{media_id}/comments"
-                response = self.session.get(url)
-                response.raise_for_status()
-            data = response.json()
+            url = self._comments_url_template.format(media_id)
+            response = self._request('GET', url, params=self._auth_params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
             comments_list = [{'id': comment.get('id'), 'text': comment.get('text')} for comment in data.get('data', [])]
-            self.logger.info(f"Fetched comments for post {media_id} on Instagram.")
+            self.logger.info("Fetched comments for post %s on Instagram.", media_id)
             return comments_list
         except Exception as e:
-            self.logger.error(f"Failed to fetch comments for {media_id} on Instagram: {e}", exc_info=True)
+            self.logger.error("Failed to fetch comments for %s on Instagram: %s", media_id, e, exc_info=True)
             raise
         
     def post_image(self, image_url, caption):
@@ -137,9 +289,10 @@ class InstagramIntegration(SocialMediaIntegration):
                 'caption': caption,
                 'access_token': self.access_token
             }
-            upload_response = self.session.post(upload_url, data=upload_data)
-            upload_response.raise_for_status()
-            media_id = upload_response.json().get('id')
+            upload_response = self._request('POST', upload_url, data=upload_data)
+            if not upload_response.ok:
+                return self._post_image_error(upload_response)
+            media_id = orjson.loads(upload_response.content).get('id')
 
             # Publish the image (Step 2)
             publish_url = f"{self.base_url}me/media_publish"
@@ -147,18 +300,30 @@ class InstagramIntegration(SocialMediaIntegration):
                 'creation_id': media_id,
                 'access_token': self.access_token
             }
-            publish_response = self.session.post(publish_url, data=publish_data)
-            publish_response.raise_for_status()
+            publish_response = self._request('POST', publish_url, data=publish_data)
+            if not publish_response.ok:
+                return self._post_image_error(publish_response)
 
-            post_id = publish_response.json().get('id')
+            post_id = orjson.loads(publish_response.content).get('id')
             post_url = f"https://www.instagram.com/p/{post_id}/"
-            self.logger.info(f"Image posted successfully: {post_url}")
+            self.logger.info("Image posted successfully: %s", post_url)
             return {"status": "success", "url": post_url}
 
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to post image on Instagram: {e}")
+            self.logger.error("Failed to post image on Instagram: %s", e)
             return {"status": "error", "message": str(e)}
 
+    def _post_image_error(self, response):
+        """
+        Log a failed image upload or publish response and build the error result.
+
+        :param response: The non-2xx response.
+        :return: The error result of the post operation.
+        """
+        message = f"HTTP {response.status_code}: {response.text[:200]}"
+        self.logger.error("Failed to post image on Instagram: %s", message)
+        return {"status": "error", "message": message}
+
     def post_comment(self, media_id, comment_text):
         """
         Post a comment on a specific Instagram media (post).
@@ -167,15 +332,78 @@ class InstagramIntegration(SocialMediaIntegration):
         :param comment_text: The text of the comment to post.
         :return: The result of the comment operation.
         """
-        if self.use_graph_api:
-            url = f"{self.base_url}{media_id}/comments"
-            data = {"message": comment_text, 'access_token': self.access_token}
-        else:
-            url = f"{self.base_url}/media/{media_id}/comments"
-            data = {"text": comment_text}
+        url = self._comments_url_template.format(media_id)
+        self.logger.info("Posting comment on media ID: %s", media_id)
+        return self._execute_request('POST', url, data=self._encode_text_body(comment_text), headers=self.FORM_HEADERS)
+
+    def post_comments_bulk(self, items, max_workers=16):
+        """
+        Post several comments concurrently on the shared worker pool and keep-alive connection pool.
+
+        Must not be called from an ig-io worker, for example through _run_in_pool: it blocks that
+        worker waiting on others from the same pool, and enough such callers would deadlock it.
+
+        :param items: A list of (media_id, comment_text) tuples.
+        :param max_workers: The maximum number of comments posted at the same time.
+        :return: A list with the result of each comment operation, in the order of `items`.
+        :raises RuntimeError: If called from an ig-io worker thread.
+        """
+        if threading.current_thread().name.startswith("ig-io"):
+            raise RuntimeError("post_comments_bulk must not be called from an ig-io worker thread.")
+        # Bound the calls in flight here, since the pool's workers are shared with other callers.
+        in_flight = threading.BoundedSemaphore(max_workers)
+        futures = []
+        for media_id, comment_text in items:
+            in_flight.acquire()
+            future = _POOL.submit(self.post_comment, media_id, comment_text)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def reply_to_posts_batch(self, replies):
+        """
+        Comment on several posts with Graph API batch requests, up to BATCH_SIZE per round trip.
+
+        :param replies: A list of (media_id, comment_text) tuples.
+        :return: A list with the decoded result of each comment, or None for failed ones,
+                 in the order of `replies`.
+        """
+        if not self.use_graph_api:
+            raise NotImplementedError("Batch requests are only supported with the Graph API.")
+
+        results = []
+        for start in range(0, len(replies), self.BATCH_SIZE):
+            chunk = replies[start:start + self.BATCH_SIZE]
+            batch = [
+                {'method': 'POST', 'relative_url': f"{media_id}/comments", 'body': f"message={quote_plus(text)}"}
+                for media_id, text in chunk
+            ]
+            data = {'batch': orjson.dumps(batch).decode(), **self._auth_params}
+            responses = self._execute_request('POST', self.base_url, data=data) or [None] * len(chunk)
+            for media_id_and_text, sub_response in zip(chunk, responses):
+                if sub_response and sub_response.get('code') == 200:
+                    results.append(self._decode_batch_body(media_id_and_text[0], sub_response))
+                else:
+                    self.logger.error("Batched comment on media ID %s failed: %s", media_id_and_text[0], sub_response)
+                    results.append(None)
+        return results
+
+    def _decode_batch_body(self, media_id, sub_response):
+        """
+        Decode the body of one successful batch sub-response.
 
-        self.logger.info(f"Posting comment on media ID: {media_id}")
-        return self._execute_post_request(url, data)
+        :param media_id: The media ID the sub-request commented on, for logging.
+        :param sub_response: The sub-response, with its JSON body as a string.
+        :return: The decoded body, or None if it is missing or not valid JSON.
+        """
+        try:
+            body = orjson.loads(sub_response.get('body') or 'null')
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Invalid JSON in batched comment response for media ID %s: %s", media_id, e)
+            return None
+        if body is None:
+            self.logger.error("Batched comment on media ID %s returned no body.", media_id)
+        return body
 
     def reply_to_comment(self, comment_id, reply_text):
         """
@@ -185,15 +413,9 @@ class InstagramIntegration(SocialMediaIntegration):
         :param reply_text: The text of the reply.
         :return: The result of the reply operation.
         """
-        if self.use_graph_api:
-            url = f"{self.base_url}{comment_id}/replies"
-            data = {"message": reply_text, 'access_token': self.access_token}
-        else:
-            url = f"{self.base_url}/media/{comment_id}/comments"
-            data = {"text": reply_text}
-
-        self.logger.info(f"Posting reply to comment ID: {comment_id}")
-        return self._execute_post_request(url, data)
+        url = self._replies_url_template.format(comment_id)
+        self.logger.info("Posting reply to comment ID: %s", comment_id)
+        return self._execute_request('POST', url, data=self._encode_text_body(reply_text), headers=self.FORM_HEADERS)
 
     def follow_users(self, amount, tags):
         """
@@ -232,22 +454,24 @@ class InstagramIntegration(SocialMediaIntegration):
         if not self.use_graph_api:
             raise NotImplementedError("User ID retrieval is only supported with the Graph API.")
 
+        if self._user_id:
+            return self._user_id
+
         url = f"{self.base_url}me"
-        params = {'access_token': self.access_token}
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            user_id = response.json().get('id')
-            self.logger.info(f"User ID retrieved successfully: {user_id}")
-            return user_id
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to retrieve user ID: {e}")
+        data = self._execute_request('GET', url, params=self._auth_params)
+        if not data:
+            self.logger.error("Failed to retrieve user ID.")
             return None
+        user_id = data.get('id')
+        self._user_id = user_id
+        self.logger.info("User ID retrieved successfully: %s", user_id)
+        return user_id
 
     def _get_hashtag_id(self, hashtag):
         """
         Retrieve the hashtag ID for a specific hashtag using the Graph API.
-        This ID is necessary for fetching media related to a hashtag.
+        This ID is necessary for fetching media related to a hashtag. Concurrent lookups of
+        the same hashtag share a single request.
 
         :param hashtag: The hashtag to search for.
         :return: The hashtag ID, or None if retrieval fails.
@@ -255,74 +479,141 @@ class InstagramIntegration(SocialMediaIntegration):
         if not self.use_graph_api:
             raise NotImplementedError("Hashtag ID retrieval is only supported with the Graph API.")
 
+        if hashtag in self._hashtag_cache:
+            return self._hashtag_cache[hashtag]
+
+        with self._inflight_lock:
+            if hashtag in self._hashtag_cache:
+                return self._hashtag_cache[hashtag]
+            event = self._inflight_hashtags.get(hashtag)
+            is_leader = event is None
+            if is_leader:
+                event = self._inflight_hashtags[hashtag] = threading.Event()
+
+        if not is_leader:
+            event.wait()
+            return self._hashtag_cache.get(hashtag)
+
+        try:
+            return self._lookup_hashtag_id(hashtag)
+        finally:
+            with self._inflight_lock:
+                self._inflight_hashtags.pop(hashtag, None)
+            event.set()
+
+    def _lookup_hashtag_id(self, hashtag):
+        """
+        Query the Graph API hashtag search for a hashtag ID and cache the result.
+
+        :param hashtag: The hashtag to search for.
+        :return: The hashtag ID, or None if retrieval fails.
+        """
         url = f"{self.base_url}ig_hashtag_search"
-        params = {'user_id': self._get_user_id(), 'q': hashtag, 'access_token': self.access_token}
+        params = {'user_id': self._get_user_id(), 'q': hashtag, **self._auth_params}
+        data = self._execute_request('GET', url, params=params)
+        if not data or not data.get('data'):
+            self.logger.error("Failed to retrieve hashtag ID for %s.", hashtag)
+            return None
+        hashtag_id = data['data'][0].get('id')
+        if hashtag_id:
+            self._hashtag_cache[hashtag] = hashtag_id
+        self.logger.info("Hashtag ID retrieved successfully for %s: %s", hashtag, hashtag_id)
+        return hashtag_id
+
+    def _send(self, method, url, headers=None, **kwargs):
+        """
+        Send a request through the shared session, whose adapter retries rate-limited and
+        transient server errors on GET requests with exponential backoff, honoring Retry-After.
+        POST requests are sent once.
+
+        :param method: The HTTP method to use.
+        :param url: The URL to send the request to.
+        :param headers: Optional headers added to the instance's authorization headers.
+        :param kwargs: Additional arguments passed to the session, such as params or data.
+        :return: The response, or None on failure.
+        """
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            hashtag_id = response.json().get('data')[0].get('id')
-            self.logger.info(f"Hashtag ID retrieved successfully for {hashtag}: {hashtag_id}")
-            return hashtag_id
+            response = self._request(method, url, headers=headers, **kwargs)
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to retrieve hashtag ID for {hashtag}: {e}")
+            self.logger.error("Error during %s request to %s: %s", method, url, e)
+            return None
+        except Exception as e:
+            self.logger.error("Unexpected error during %s request to %s: %s", method, url, e)
             return None
 
-    def _execute_get_request(self, url, params, retries, backoff_factor):
-        """
-        Execute a GET request with retry logic.
-
-        :param url: The URL to send the GET request to.
-        :param params: The parameters to include in the request.
-        :param retries: The number of retries in case of failure.
-        :param backoff_factor: The factor for increasing the delay between retries.
-        :return: The response data as a dictionary, or an empty list on failure.
-        """
-        attempt = 0
-        while attempt < retries:
-            try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                return response.json().get('data', [])
-            except requests.exceptions.RequestException as e:
-                if response.status_code == 429:  # Rate limit error
-                    self.logger.warning(f"Rate limit exceeded. Retrying after delay. Attempt {attempt + 1}")
-                    time.sleep(2 ** attempt * backoff_factor)
-                else:
-                    self.logger.error(f"Error during GET request: {e}")
-                    time.sleep(2 ** attempt * backoff_factor)
-            except Exception as e:
-                self.logger.error(f"Unexpected error during GET request: {e}")
-                time.sleep(2 ** attempt * backoff_factor)
-            attempt += 1
-        self.logger.error(f"Failed to execute GET request after {retries} attempts.")
-        return []
-
-    def _execute_post_request(self, url, data, retries=3, backoff_factor=0.3):
-        """
-        Execute a POST request with retry logic.
-
-        :param url: The URL to send the POST request to.
-        :param data: The data to include in the request.
-        :param retries: The number of retries in case of failure.
-        :param backoff_factor: The factor for increasing the delay between retries.
-        :return: The response data as a dictionary, or None on failure.
-        """
-        attempt = 0
-        while attempt < retries:
-            try:
-                response = self.session.post(url, data=data)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                if response.status_code == 429:  # Rate limit error
-                    self.logger.warning(f"Rate limit exceeded. Retrying after delay. Attempt {attempt + 1}")
-                    time.sleep(2 ** attempt * backoff_factor)
-                else:
-                    self.logger.error(f"Error during POST request: {e}")
-                    time.sleep(2 ** attempt * backoff_factor)
-            except Exception as e:
-                self.logger.error(f"Unexpected error during POST request: {e}")
-                time.sleep(2 ** attempt * backoff_factor)
-            attempt += 1
-        self.logger.error(f"Failed to execute POST request after {retries} attempts.")
-        return None
+        # The adapter has already retried 429 and 5xx responses to reads; anything still failing is final.
+        if not response.ok:
+            if response.status_code in (401, 403):
+                self._clear_id_cache()
+            self.logger.error("HTTP %d from %s request to %s: %s", response.status_code, method, url, response.text[:200])
+            return None
+        return response
+
+    def _request(self, method, url, headers=None, **kwargs):
+        """
+        Send a request through the shared session once the rate limiter allows it, and adjust
+        the limiter from the usage the response reports. Every Graph API call goes through here.
+
+        :param method: The HTTP method to use.
+        :param url: The URL to send the request to.
+        :param headers: Optional headers added to the instance's authorization headers.
+        :param kwargs: Additional arguments passed to the session, such as params or data.
+        :return: The response, whatever its status.
+        :raises requests.exceptions.RequestException: If the request could not be sent.
+        """
+        self.limiter.acquire()
+        response = self.session.request(method, url, headers={**self.headers, **headers} if headers else self.headers, **kwargs)
+        self._update_rate_limit(response)
+        return response
+
+    def _execute_request(self, method, url, **kwargs):
+        """
+        Execute a request and decode its JSON body.
+
+        :param method: The HTTP method to use.
+        :param url: The URL to send the request to.
+        :param kwargs: Additional arguments passed to `_send`.
+        :return: The decoded response body, or None on failure.
+        """
+        response = self._send(method, url, **kwargs)
+        if response is None:
+            return None
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Invalid JSON in response from %s: %s", url, e)
+            return None
+
+    def _encode_text_body(self, text):
+        """
+        Build the urlencoded body for a comment or reply, reusing the pre-quoted access token.
+
+        :param text: The text of the comment or reply.
+        :return: The encoded request body.
+        """
+        return f"{self._text_field}={quote_plus(text)}{self._auth_query}".encode()
+
+    def _clear_id_cache(self):
+        """
+        Forget the cached user and hashtag IDs, e.g. after the access token was rejected.
+        """
+        self._user_id = None
+        self._hashtag_cache.clear()
+
+    def _update_rate_limit(self, response):
+        """
+        Adjust the request rate from the X-App-Usage header returned by the Graph API.
+
+        The header reports the percentage of the app's quota consumed for call count,
+        total time and CPU time; the highest of the three drives the limiter.
+
+        :param response: The response whose headers should be inspected.
+        """
+        usage_header = response.headers.get('X-App-Usage')
+        if not usage_header:
+            return
+        try:
+            usage = orjson.loads(usage_header)
+            self.limiter.update_usage(max(usage.values(), default=0))
+        except (ValueError, TypeError, AttributeError):
+            self.logger.debug("Ignoring malformed X-App-Usage header: %s", usage_header)
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+
+class TokenBucket:
+    """
+    TokenBucket is a thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `refill_per_sec` up to `capacity`; each request consumes one token
+    and only waits when the bucket is empty, so bursts within the quota are never delayed.
+    """
+
+    def __init__(self, capacity, refill_per_sec):
+        """
+        Initialize the TokenBucket with a full bucket.
+
+        :param capacity: The maximum number of tokens (the allowed burst size).
+        :param refill_per_sec: The number of tokens added per second.
+        """
+        self.capacity = capacity
+        self.base_refill_per_sec = refill_per_sec
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Add the tokens accumulated since the last refill. Must be called with the lock held.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+        self.last_refill = now
+
+    def acquire(self):
+        """
+        Take one token, sleeping only as long as needed for one to become available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_per_sec
+            time.sleep(wait)
+
+    def update_usage(self, usage_percent):
+        """
+        Scale the refill rate down as the server-reported quota usage grows.
+
+        :param usage_percent: The share of the quota already consumed, from 0 to 100.
+        """
+        remaining = max(0.0, 100.0 - usage_percent) / 100.0
+        with self._lock:
+            self._refill()
+            # Keep a small floor so the limiter never stalls completely.
+            self.refill_per_sec = max(self.base_refill_per_sec * remaining, self.base_refill_per_sec * 0.01)
+
+
+class SlidingWindowLimiter:
+    """
+    SlidingWindowLimiter is a thread-safe sliding-log rate limiter.
+
+    It allows at most `max_calls` within any `period` seconds, waiting locally once the budget is
+    spent so that no request reaches the server while the account is throttled.
+    """
+
+    def __init__(self, max_calls, period):
+        """
+        Initialize the SlidingWindowLimiter with an empty call log.
+
+        :param max_calls: The maximum number of calls allowed within one window.
+        :param period: The window length in seconds.
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Record one call, sleeping until the oldest call in the window expires if the budget is spent.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self.calls and self.calls[0] <= now - self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
+                wait = self.calls[0] + self.period - now
+            time.sleep(wait)
@@ -1,7 +1,115 @@
+import asyncio
+import base64
+import httpx
+import io
+import os
+import random
 import requests
 import logging
+import orjson
+import threading
+import time
+import uuid
+from urllib.parse import quote, urlparse
+from requests.adapters import HTTPAdapter
 from social_media.social_media_base import SocialMediaIntegration
 
+# Every TwitterIntegration mounts this adapter, so all instances in the process share one
+# connection pool to the API while keeping their own credentials. It holds enough connections
+# for every concurrent batch request to reuse one.
+_API_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=64)
+
+# Media downloads go to third-party hosts, so they share a credential-free keep-alive session
+# instead of opening a new connection per upload.
+_DOWNLOAD_SESSION = requests.Session()
+# Images can come from several CDN hosts; keep a warm pool for each of the most recent ones.
+_DOWNLOAD_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+class _TTLCache:
+    """
+    A small thread-safe cache whose entries expire after a fixed time-to-live.
+
+    Once `maxsize` entries are stored, the oldest entry is evicted to make room.
+    """
+
+    def __init__(self, maxsize, ttl):
+        """
+        :param maxsize: The maximum number of entries to keep.
+        :param ttl: The number of seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: The key to look up.
+        :return: The cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        :param key: The key to store the value under.
+        :param value: The value to cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+class _MultipartUpload:
+    """
+    A file-like multipart/form-data body with a single file field.
+
+    The file part is read lazily as the body is sent, so a streamed download can be piped into
+    an upload without holding the whole file in memory. The total length is known up front, so
+    the request is sent with a Content-Length rather than chunked.
+    """
+
+    def __init__(self, field, filename, fileobj, file_content_type, file_length):
+        """
+        :param field: The form field name.
+        :param filename: The file name to report for the part.
+        :param fileobj: A readable file object with the part's contents.
+        :param file_content_type: The Content-Type of the part.
+        :param file_length: The number of bytes `fileobj` will produce.
+        """
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename.replace(chr(34), "")}"\r\n'
+            f'Content-Type: {file_content_type}\r\n\r\n'
+        ).encode()
+        tail = f'\r\n--{boundary}--\r\n'.encode()
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + file_length + len(tail)
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b''.join(chunks)
+
 class TwitterIntegration(SocialMediaIntegration):
     """
     TwitterIntegration handles interaction with the Twitter API,
@@ -9,6 +117,30 @@ class TwitterIntegration(SocialMediaIntegration):
     """
 
     BASE_URL = "https://api.twitter.com/2/"
+    TWEETS_URL = BASE_URL + "tweets"
+    SEARCH_URL = BASE_URL + "tweets/search/recent"
+    MEDIA_UPLOAD_URL = BASE_URL + "media/upload"
+    # Query parameters shared by every lookup or search; requests never mutates them.
+    LOOKUP_FIELDS = {'tweet.fields': 'text,entities'}
+    SEARCH_FIELDS = {'tweet.fields': 'author_id,created_at'}
+    CONVERSATION_FIELDS = {'tweet.fields': 'author_id,conversation_id,created_at'}
+    TOKEN_URL = "https://api.twitter.com/oauth2/token"
+    TOKEN_REQUEST_BODY = b"grant_type=client_credentials"
+    MAX_CONCURRENT_REQUESTS = 16
+    # (connect, read) timeouts in seconds, so a stalled endpoint can't hold a worker forever.
+    TIMEOUT = (3.0, 10.0)
+    # The tweet lookup endpoint accepts up to 100 IDs per request.
+    LOOKUP_BATCH_SIZE = 100
+    # Hashtag searches are reused within the same minute instead of hitting the API again.
+    SEARCH_CACHE_WINDOW = 60
+    # Longest a request loop sleeps before a retry. A rate limit lasting longer is reported
+    # as a failed request instead of stalling the caller for minutes.
+    MAX_RETRY_WAIT = 30
+    # App-only bearer tokens are cached just under an hour before being requested again.
+    TOKEN_TTL = 3500
+
+    _token_cache = {}
+    _token_lock = threading.Lock()
 
     def __init__(self, config_manager):
         """
@@ -17,16 +149,96 @@ class TwitterIntegration(SocialMediaIntegration):
         :param config_manager: An instance of ConfigManager to retrieve configuration settings.
         """
         self.api_key = config_manager.get("twitter_api_key")
-        self.api_secret = config_manager.get("twitter_api_secret")
+        self.api_secret = config_manager.get("twitter_api_secret_key")
         self.bearer_token = config_manager.get("twitter_bearer_token")
         self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.bearer_token}',
-            'Content-Type': 'application/json'
-        })
+        self.session.mount('https://', _API_ADAPTER)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        if self.bearer_token:
+            self.session.headers['Authorization'] = f'Bearer {self.bearer_token}'
+        else:
+            # Without a configured token, every request picks up the cached app-only token.
+            self.session.auth = self._apply_bearer_token
+        # The client-credentials request never changes, so its Basic auth header is built once.
+        credentials = f"{quote(str(self.api_key), safe='')}:{quote(str(self.api_secret), safe='')}"
+        self._token_request_headers = {
+            'Authorization': 'Basic ' + base64.b64encode(credentials.encode()).decode(),
+            'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'
+        }
+        self._search_cache = {}
+        # Tweets rarely change once posted; their replies change often.
+        self._post_cache = _TTLCache(maxsize=4096, ttl=300)
+        self._comments_cache = _TTLCache(maxsize=2048, ttl=60)
+        self._search_cache_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         self.logger.info("TwitterIntegration initialized with provided API credentials.")
 
+    def get_cached_token(self):
+        """
+        Return the cached app-only bearer token for this API key, if it has not expired.
+
+        :return: The bearer token, or None if no valid token is cached.
+        """
+        with self._token_lock:
+            entry = self._token_cache.get(self.api_key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def cache_token(self, token):
+        """
+        Cache an app-only bearer token for this API key, shared by every instance in the process.
+
+        :param token: The bearer token to cache.
+        """
+        with self._token_lock:
+            self._token_cache[self.api_key] = (token, time.monotonic() + self.TOKEN_TTL)
+
+    def authenticate(self):
+        """
+        Request an app-only bearer token using the API key and secret, and cache it.
+
+        :return: The bearer token.
+        :raises requests.exceptions.RequestException: If the token request fails.
+        """
+        try:
+            response = self.session.post(
+                self.TOKEN_URL,
+                data=self.TOKEN_REQUEST_BODY,
+                headers=self._token_request_headers,
+                auth=self._apply_token_request_auth,
+                timeout=self.TIMEOUT
+            )
+            response.raise_for_status()
+            token = self._json(response)['access_token']
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            self.logger.error("Failed to authenticate with Twitter: %s", e)
+            raise
+        self.cache_token(token)
+        self.logger.info("Obtained a new app-only bearer token from Twitter.")
+        return token
+
+    def _apply_token_request_auth(self, request):
+        """
+        Attach the precomputed Basic auth header to the token request, in place of the session's bearer auth.
+
+        :param request: The prepared token request.
+        :return: The authorized request.
+        """
+        request.headers['Authorization'] = self._token_request_headers['Authorization']
+        return request
+
+    def _apply_bearer_token(self, request):
+        """
+        Attach the cached bearer token to an outgoing request, authenticating only on a cache miss.
+
+        :param request: The prepared request to authorize.
+        :return: The authorized request.
+        """
+        token = self.get_cached_token() or self.authenticate()
+        request.headers['Authorization'] = f'Bearer {token}'
+        return request
+
     # Existing methods...
 
     def fetch_post_content(self, media_id):
@@ -39,24 +251,56 @@ class TwitterIntegration(SocialMediaIntegration):
         Returns:
             dict: The content of the tweet.
         """
-        try:
-            url = f"{self.BASE_URL}tweets/{media_id}"
-            params = {'tweet.fields': 'text,entities'}
+        post_content = self.fetch_posts_bulk([media_id]).get(media_id)
+        if post_content is None:
+            self.logger.error("Failed to fetch post content for %s on Twitter: tweet not found.", media_id)
+            raise LookupError(f"Tweet {media_id} not found.")
+        return post_content
 
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+    def fetch_posts_bulk(self, media_ids):
+        """
+        Fetch the content of several tweets, up to LOOKUP_BATCH_SIZE per request.
 
-            post_content = {
-                'text': data.get('data', {}).get('text', ''),
-                'media_url': data.get('data', {}).get('entities', {}).get('media', [{}])[0].get('media_url', '')
-            }
+        Tweets already in the cache are not requested again.
 
-            self.logger.info(f"Fetched content for tweet {media_id} on Twitter.")
-            return post_content
-        except Exception as e:
-            self.logger.error(f"Failed to fetch post content for {media_id} on Twitter: {e}", exc_info=True)
-            raise
+        Args:
+            media_ids (list): The IDs of the tweets to fetch the content for.
+
+        Returns:
+            dict: A mapping of each found tweet ID to its content. Missing tweets are left out.
+        """
+        contents = {}
+        missing = []
+        for media_id in dict.fromkeys(media_ids):
+            cached = self._post_cache.get(media_id)
+            if cached is not None:
+                contents[media_id] = cached
+            else:
+                missing.append(media_id)
+
+        url = self.TWEETS_URL
+        for start in range(0, len(missing), self.LOOKUP_BATCH_SIZE):
+            chunk = missing[start:start + self.LOOKUP_BATCH_SIZE]
+            try:
+                response = self.session.get(
+                    url, params={'ids': ','.join(chunk), **self.LOOKUP_FIELDS}, timeout=self.TIMEOUT, allow_redirects=False
+                )
+                response.raise_for_status()
+                data = self._json(response)
+            except Exception as e:
+                self.logger.error("Failed to fetch post content for %s tweets on Twitter: %s", len(chunk), e, exc_info=True)
+                raise
+
+            for tweet in data.get('data', []):
+                try:
+                    media_url = tweet['entities']['media'][0]['media_url']
+                except (KeyError, IndexError, TypeError):
+                    media_url = ''
+                post_content = {'text': tweet.get('text', ''), 'media_url': media_url}
+                self._post_cache.put(tweet['id'], post_content)
+                contents[tweet['id']] = post_content
+            self.logger.info("Fetched content for %s tweets on Twitter.", len(chunk))
+        return contents
 
     def fetch_comments_list(self, media_id):
         """
@@ -68,23 +312,25 @@ class TwitterIntegration(SocialMediaIntegration):
         Returns:
             list: A list of comments on the tweet.
         """
+        cached = self._comments_cache.get(media_id)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.BASE_URL}tweets/search/recent"
-            params = {
-                'query': f'conversation_id:{media_id}',
-                'tweet.fields': 'author_id,conversation_id,created_at'
-            }
+            url = self.SEARCH_URL
+            params = {'query': f'conversation_id:{media_id}', **self.CONVERSATION_FIELDS}
 
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=self.TIMEOUT, allow_redirects=False)
             response.raise_for_status()
-            data = response.json()
+            data = self._json(response)
 
             comments_list = [{'id': comment.get('id'), 'text': comment.get('text')} for comment in data.get('data', [])]
 
-            self.logger.info(f"Fetched comments for tweet {media_id} on Twitter.")
+            self.logger.info("Fetched comments for tweet %s on Twitter.", media_id)
+            self._comments_cache.put(media_id, comments_list)
             return comments_list
         except Exception as e:
-            self.logger.error(f"Failed to fetch comments for {media_id} on Twitter: {e}", exc_info=True)
+            self.logger.error("Failed to fetch comments for %s on Twitter: %s", media_id, e, exc_info=True)
             raise
 
     def get_posts(self, hashtag, retries=3, backoff_factor=0.3):
@@ -96,31 +342,216 @@ class TwitterIntegration(SocialMediaIntegration):
         :param backoff_factor: Factor for increasing delay between retries.
         :return: A list of tweets associated with the hashtag.
         """
-        url = f"{self.BASE_URL}tweets/search/recent"
-        params = {'query': f'#{hashtag}', 'tweet.fields': 'author_id,created_at'}
-        self.logger.info(f"Fetching tweets for hashtag: #{hashtag}")
+        window = int(time.time() // self.SEARCH_CACHE_WINDOW)
+        cached = self._get_cached_search(hashtag, window)
+        if cached is not None:
+            return cached
+
+        url = self.SEARCH_URL
+        params = {'query': f'#{hashtag}', **self.SEARCH_FIELDS}
+        self.logger.info("Fetching tweets for hashtag: #%s", hashtag)
+
+        data = self._get_with_retry(url, params, retries, backoff_factor)
+        if data is None:
+            self.logger.error("Failed to retrieve tweets for hashtag #%s after %s attempts.", hashtag, retries)
+            return []
+        tweets = data.get('data', [])
+        self.logger.info("Retrieved %s tweets for hashtag: #%s", len(tweets), hashtag)
+        self._cache_search(hashtag, window, tweets)
+        return tweets
+
+    async def get_posts_batch(self, hashtags):
+        """
+        Retrieve tweets for several hashtags concurrently.
+
+        All searches share one pooled httpx.AsyncClient on the running event loop, with at most
+        MAX_CONCURRENT_REQUESTS of them in flight at once.
+
+        :param hashtags: The hashtags to search for tweets.
+        :return: A dictionary mapping each hashtag to its list of tweets.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        limits = httpx.Limits(max_connections=self.MAX_CONCURRENT_REQUESTS, max_keepalive_connections=self.MAX_CONCURRENT_REQUESTS)
+
+        # The client is scoped to this call because its connections belong to the current event loop.
+        async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(self.TIMEOUT[1], connect=self.TIMEOUT[0])) as client:
+            async def fetch(hashtag):
+                async with semaphore:
+                    return await self.get_posts_async(client, hashtag)
+
+            results = await asyncio.gather(*(fetch(hashtag) for hashtag in hashtags))
+        return dict(zip(hashtags, results))
+
+    async def get_posts_async(self, client, hashtag, retries=3, backoff_factor=0.3):
+        """
+        Retrieve tweets associated with a specific hashtag without blocking the event loop.
+
+        :param client: The httpx.AsyncClient to send the search with.
+        :param hashtag: The hashtag to search for tweets.
+        :param retries: Number of retries in case of failures.
+        :param backoff_factor: Factor for increasing delay between retries.
+        :return: A list of tweets associated with the hashtag.
+        """
+        window = int(time.time() // self.SEARCH_CACHE_WINDOW)
+        cached = self._get_cached_search(hashtag, window)
+        if cached is not None:
+            return cached
+
+        url = self.SEARCH_URL
+        params = {'query': f'#{hashtag}', **self.SEARCH_FIELDS}
+        token = self.bearer_token or self.get_cached_token() or await asyncio.to_thread(self.authenticate)
+        headers = {'Authorization': f'Bearer {token}'}
+        self.logger.info("Fetching tweets for hashtag: #%s", hashtag)
+
+        data = await self._aget_with_retry(client, url, params, headers, retries, backoff_factor)
+        if data is None:
+            self.logger.error("Failed to retrieve tweets for hashtag #%s after %s attempts.", hashtag, retries)
+            return []
+        tweets = data.get('data', [])
+        self.logger.info("Retrieved %s tweets for hashtag: #%s", len(tweets), hashtag)
+        self._cache_search(hashtag, window, tweets)
+        return tweets
+
+    def _get_cached_search(self, hashtag, window):
+        """
+        Return the cached search results for a hashtag in the given one-minute window, if any.
+
+        :param hashtag: The hashtag that was searched.
+        :param window: The one-minute window the search belongs to.
+        :return: The cached list of tweets, or None on a miss.
+        """
+        with self._search_cache_lock:
+            cached = self._search_cache.get((hashtag, window))
+        if cached is not None:
+            self.logger.info("Using cached tweets for hashtag: #%s", hashtag)
+        return cached
+
+    def _cache_search(self, hashtag, window, tweets):
+        """
+        Cache the search results for a hashtag in the given one-minute window.
+
+        :param hashtag: The hashtag that was searched.
+        :param window: The one-minute window the search belongs to.
+        :param tweets: The tweets returned by the search.
+        """
+        with self._search_cache_lock:
+            # Entries from earlier windows can never be hit again.
+            for key in [key for key in self._search_cache if key[1] != window]:
+                del self._search_cache[key]
+            self._search_cache[(hashtag, window)] = tweets
+
+    @staticmethod
+    def _json(response):
+        """
+        Decode a JSON response body. Every Twitter response is parsed here.
+
+        :param response: A requests or httpx response.
+        :return: The decoded body.
+        :raises orjson.JSONDecodeError: If the body is not valid JSON.
+        """
+        return orjson.loads(response.content)
+
+    def _get_with_retry(self, url, params, retries, backoff_factor):
+        """
+        GET a JSON endpoint on the session, retrying failures according to _retry_delay.
 
-        attempt = 0
-        while attempt < retries:
+        :param url: The URL to request.
+        :param params: The query parameters.
+        :param retries: Number of attempts before giving up.
+        :param backoff_factor: Factor for increasing delay between retries.
+        :return: The decoded response body, or None if every attempt failed.
+        """
+        # Bound once up front; the loop body only touches locals.
+        session_get = self.session.get
+        decode = self._json
+        log_warning = self.logger.warning
+        timeout = self.TIMEOUT
+        for attempt in range(retries):
+            response = None
             try:
-                response = self.session.get(url, params=params)
+                response = session_get(url, params=params, timeout=timeout, allow_redirects=False)
                 response.raise_for_status()
-                tweets = response.json().get('data', [])
-                self.logger.info(f"Retrieved {len(tweets)} tweets for hashtag: #{hashtag}")
-                return tweets
-            except requests.exceptions.RequestException as e:
-                if response.status_code == 429:  # Rate limit error
-                    self.logger.warning(f"Rate limit exceeded. Retrying after delay. Attempt {attempt + 1}")
-                    time.sleep(2 ** attempt * backoff_factor)
-                else:
-                    self.logger.error(f"Error fetching tweets for hashtag #{hashtag}: {e}")
-                    time.sleep(2 ** attempt * backoff_factor)
-            except Exception as e:
-                self.logger.error(f"Unexpected error during tweet retrieval for hashtag #{hashtag}: {e}")
-                time.sleep(2 ** attempt * backoff_factor)
-            attempt += 1
-        self.logger.error(f"Failed to retrieve tweets for hashtag #{hashtag} after {retries} attempts.")
-        return []
+                return decode(response)
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                if attempt + 1 == retries:
+                    log_warning("Request to %s failed: %s. Attempt %s", url, e, attempt + 1)
+                    break
+                wait = self._retry_delay(response, attempt, backoff_factor)
+                if wait is None:
+                    log_warning("Request to %s is rate limited for longer than %ss: %s. Giving up.", url, self.MAX_RETRY_WAIT, e)
+                    break
+                log_warning("Request to %s failed: %s. Retrying in %.1fs. Attempt %s", url, e, wait, attempt + 1)
+                time.sleep(wait)
+        return None
+
+    async def _aget_with_retry(self, client, url, params, headers, retries, backoff_factor):
+        """
+        GET a JSON endpoint on an httpx.AsyncClient, retrying failures according to _retry_delay.
+
+        :param client: The httpx.AsyncClient to send the request with.
+        :param url: The URL to request.
+        :param params: The query parameters.
+        :param headers: The request headers.
+        :param retries: Number of attempts before giving up.
+        :param backoff_factor: Factor for increasing delay between retries.
+        :return: The decoded response body, or None if every attempt failed.
+        """
+        for attempt in range(retries):
+            response = None
+            try:
+                response = await client.get(url, params=params, headers=headers)
+                response.raise_for_status()
+                return self._json(response)
+            except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+                if attempt + 1 == retries:
+                    self.logger.warning("Request to %s failed: %s. Attempt %s", url, e, attempt + 1)
+                    break
+                wait = self._retry_delay(response, attempt, backoff_factor)
+                if wait is None:
+                    self.logger.warning("Request to %s is rate limited for longer than %ss: %s. Giving up.", url, self.MAX_RETRY_WAIT, e)
+                    break
+                self.logger.warning("Request to %s failed: %s. Retrying in %.1fs. Attempt %s", url, e, wait, attempt + 1)
+                await asyncio.sleep(wait)
+        return None
+
+    def _retry_delay(self, response, attempt, backoff_factor):
+        """
+        The retry policy shared by every Twitter request loop.
+
+        :param response: The failed response, or None if the connection never produced one.
+        :param attempt: The zero-based number of the failed attempt.
+        :param backoff_factor: Factor for increasing delay between retries.
+        :return: The number of seconds to wait before the next attempt, or None if the request
+                 is rate limited for longer than MAX_RETRY_WAIT, or for an unknown time, and should
+                 not be retried.
+        """
+        if response is None:
+            # Nothing reached the server, so the connection can be retried right away.
+            return 0.0
+        if response.status_code == 429:
+            wait = self._rate_limit_delay(response)
+            return wait if wait is not None and wait <= self.MAX_RETRY_WAIT else None
+        return random.uniform(0, 2 ** attempt * backoff_factor)
+
+    def _rate_limit_delay(self, response):
+        """
+        Work out how long to wait after a 429 from the delay Twitter reports, preferring Retry-After.
+
+        :param response: The rate-limited response.
+        :return: The number of seconds to sleep, with a little jitter so workers don't retry in lockstep,
+                 or None if the response reports no delay.
+        """
+        retry_after = response.headers.get('retry-after', '')
+        reset = response.headers.get('x-rate-limit-reset', '')
+        if retry_after.isdigit():
+            wait = float(retry_after)
+        elif reset.isdigit():
+            wait = max(0.0, int(reset) - time.time())
+        else:
+            # Rate-limit windows are minutes long, longer than MAX_RETRY_WAIT, so guessing a delay
+            # would only burn the remaining retries.
+            return None
+        return wait + random.uniform(0, 0.25 * wait)
 
     def post_image(self, image_url, caption):
         """
@@ -132,21 +563,21 @@ class TwitterIntegration(SocialMediaIntegration):
         """
         media_id = self._upload_media(image_url)
         if not media_id:
-            self.logger.error(f"Failed to upload image to Twitter.")
+            self.logger.error("Failed to upload image to Twitter.")
             return {"status": "error", "message": "Image upload failed."}
 
-        url = f"{self.BASE_URL}tweets"
+        url = self.TWEETS_URL
         data = {"text": caption, "media": {"media_ids": [media_id]}}
 
         try:
-            response = self.session.post(url, json=data)
+            response = self.session.post(url, data=orjson.dumps(data), timeout=self.TIMEOUT)
             response.raise_for_status()
-            tweet_id = response.json().get('data', {}).get('id')
+            tweet_id = self._json(response).get('data', {}).get('id')
             tweet_url = f"https://twitter.com/user/status/{tweet_id}"
-            self.logger.info(f"Tweet posted successfully: {tweet_url}")
+            self.logger.info("Tweet posted successfully: %s", tweet_url)
             return {"status": "success", "url": tweet_url}
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to post tweet on Twitter: {e}")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            self.logger.error("Failed to post tweet on Twitter: %s", e)
             return {"status": "error", "message": str(e)}
 
     def post_comment(self, tweet_id, comment_text):
@@ -157,17 +588,12 @@ class TwitterIntegration(SocialMediaIntegration):
         :param comment_text: The text of the comment (reply) to post.
         :return: The result of the comment operation.
         """
-        url = f"{self.BASE_URL}tweets"
-        data = {"text": comment_text, "in_reply_to_status_id": tweet_id}
-
         try:
-            response = self.session.post(url, json=data)
-            response.raise_for_status()
-            comment_id = response.json().get('data', {}).get('id')
-            self.logger.info(f"Comment posted on tweet ID {tweet_id}.")
+            comment_id = self._reply(tweet_id, comment_text)
+            self.logger.info("Comment posted on tweet ID %s.", tweet_id)
             return {"status": "success", "comment_id": comment_id}
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to post comment on tweet ID {tweet_id}: {e}")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            self.logger.error("Failed to post comment on tweet ID %s: %s", tweet_id, e)
             return {"status": "error", "message": str(e)}
 
     def reply_to_comment(self, comment_id, reply_text):
@@ -178,19 +604,28 @@ class TwitterIntegration(SocialMediaIntegration):
         :param reply_text: The text of the reply.
         :return: The result of the reply operation.
         """
-        url = f"{self.BASE_URL}tweets"
-        data = {"text": reply_text, "in_reply_to_status_id": comment_id}
-
         try:
-            response = self.session.post(url, json=data)
-            response.raise_for_status()
-            reply_id = response.json().get('data', {}).get('id')
-            self.logger.info(f"Reply posted to comment ID {comment_id}.")
+            reply_id = self._reply(comment_id, reply_text)
+            self.logger.info("Reply posted to comment ID %s.", comment_id)
             return {"status": "success", "reply_id": reply_id}
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to reply to comment ID {comment_id}: {e}")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            self.logger.error("Failed to reply to comment ID %s: %s", comment_id, e)
             return {"status": "error", "message": str(e)}
 
+    def _reply(self, in_reply_to, text):
+        """
+        Post a tweet in reply to another tweet. Comments and replies are both replies on Twitter.
+
+        :param in_reply_to: The ID of the tweet being replied to.
+        :param text: The text of the reply.
+        :return: The ID of the new tweet.
+        :raises requests.exceptions.RequestException: If the request fails.
+        """
+        data = {"text": text, "reply": {"in_reply_to_tweet_id": in_reply_to}}
+        response = self.session.post(self.TWEETS_URL, data=orjson.dumps(data), timeout=self.TIMEOUT)
+        response.raise_for_status()
+        return self._json(response).get('data', {}).get('id')
+
     def follow_users(self, amount, tags):
         """
         Follow users on Twitter based on specified tags.
@@ -225,15 +660,33 @@ class TwitterIntegration(SocialMediaIntegration):
         :param image_url: The URL of the image to upload.
         :return: The media ID for the uploaded image, or None if the upload fails.
         """
-        url = f"{self.BASE_URL}media/upload"
-        files = {'media': requests.get(image_url).content}
+        url = self.MEDIA_UPLOAD_URL
 
         try:
-            response = self.session.post(url, files=files)
+            with _DOWNLOAD_SESSION.get(image_url, stream=True, timeout=self.TIMEOUT) as image_response:
+                image_response.raise_for_status()
+                headers = image_response.headers
+                if headers.get('Content-Length', '').isdigit() and 'Content-Encoding' not in headers:
+                    # Pipe the raw download into the upload so the image is never fully buffered.
+                    image, length = image_response.raw, int(headers['Content-Length'])
+                else:
+                    # Without a reliable length the body would have to be chunked; buffer it instead.
+                    content = image_response.content
+                    image, length = io.BytesIO(content), len(content)
+                body = _MultipartUpload(
+                    'media',
+                    os.path.basename(urlparse(image_url).path) or 'media',
+                    image,
+                    headers.get('Content-Type', 'application/octet-stream'),
+                    length
+                )
+                response = self.session.post(
+                    url, data=body, headers={'Content-Type': body.content_type}, timeout=self.TIMEOUT
+                )
             response.raise_for_status()
-            media_id = response.json().get('media_id_string')
-            self.logger.info(f"Media uploaded successfully: {media_id}")
+            media_id = self._json(response).get('media_id_string')
+            self.logger.info("Media uploaded successfully: %s", media_id)
             return media_id
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to upload media to Twitter: {e}")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            self.logger.error("Failed to upload media to Twitter: %s", e)
             return None
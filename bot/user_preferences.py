@@ -1,81 +1,308 @@
+import asyncio
+import atexit
 import logging
+import sys
+import threading
+import time
+import weakref
+from collections import ChainMap, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 from config_manager import ConfigManager
 from database_client import DatabaseClient
 
+_RESPONSE_STYLES = frozenset({"friendly", "formal", "casual"})
+_CONTENT_TONES = frozenset({"neutral", "positive", "negative"})
+_INTERACTION_TYPES = frozenset({"proactive", "reactive", "neutral"})
+
+# Stored with every validated row; bump it whenever the validation rules change so
+# rows written under the old rules are validated again when loaded.
+SCHEMA_VERSION = 1
+
+# Background refreshes and prewarms for every instance, so constructing preferences for many
+# users doesn't leave a pool of idle threads behind per user.
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefs-refresh")
+
+@lru_cache(maxsize=8192)
+def _caption_features(tags, engagement_counts):
+    """
+    Parse a caption's tags and sum its engagement; memoized on the raw values.
+
+    :param tags: The caption's comma-separated tags.
+    :param engagement_counts: The caption's (likes, shares, comments).
+    :return: A (frozenset of tags, engagement) tuple.
+    """
+    return frozenset(tag.strip() for tag in (tags or '').split(',')), sum(engagement_counts)
+
+def caption_features(caption):
+    """
+    Return a caption's tag set and engagement, computing them once per distinct set of values.
+
+    The result is kept in a side cache rather than on the row, so the caller's caption
+    dictionaries are left exactly as the database returned them.
+
+    :param caption: A caption row from the database.
+    :return: A (frozenset of tags, engagement) tuple.
+    """
+    return _caption_features(
+        caption.get('tags'),
+        (caption.get('likes', 0), caption.get('shares', 0), caption.get('comments', 0))
+    )
+
 class UserPreferences:
-    _instance = None
+    # One shared instance per user ID, dropped once nothing references it any more.
+    _instances = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+    # Tables known to exist, so each is checked once per process rather than on every load.
+    _schema_ready = set()
+    # Default preferences per ConfigManager, shared by every user's instance.
+    _defaults_memo = weakref.WeakKeyDictionary()
+
+    # How long aget_preferences waits to collect concurrent lookups into one query, in seconds.
+    COALESCE_DELAY = 0.005
+    # How long update_preferences waits to merge further updates into one database write, in seconds.
+    # None writes every update before update_preferences returns. Deferred writes still pending
+    # when the process is killed or crashes are lost, so only enable them where that is acceptable.
+    WRITE_BACK_DELAY = None
+
+    # (preference key, allowed values, ConfigManager key of its default, fallback default);
+    # invalid values fall back to the configured default.
+    _VALIDATION_SCHEMA = (
+        ("response_style", _RESPONSE_STYLES, "default_response_style", "friendly"),
+        ("content_tone", _CONTENT_TONES, "default_content_tone", "neutral"),
+        ("content_frequency", frozenset({"daily", "weekly", "monthly"}), "default_content_frequency", "daily"),
+        ("notification_method", frozenset({"email", "sms", "none"}), "default_notification_method", "email"),
+        ("interaction_type", _INTERACTION_TYPES, "default_interaction_type", "reactive"),
+        ("comment_response_style", _RESPONSE_STYLES, "default_comment_response_style", "friendly"),
+        ("comment_content_tone", _CONTENT_TONES, "default_comment_content_tone", "positive"),
+        ("comment_interaction_type", _INTERACTION_TYPES, "default_comment_interaction_type", "proactive"),
+        ("reply_response_style", _RESPONSE_STYLES, "default_reply_response_style", "formal"),
+        ("reply_content_tone", _CONTENT_TONES, "default_reply_content_tone", "neutral"),
+        ("reply_interaction_type", _INTERACTION_TYPES, "default_reply_interaction_type", "reactive"),
+    )
+
+    # Post preferences are free-form; missing ones are filled in with these defaults.
+    _POST_DEFAULTS = (
+        ("length", "short"),
+        ("category", "general"),
+        ("audience", "general"),
+        ("language", "en"),
+        ("tone", "reserved"),
+    )
+
+    # Allowed values of each validated preference.
+    _ALLOWED_VALUES = {rule[0]: rule[1] for rule in _VALIDATION_SCHEMA}
+
+    # (preference key, prompt, default answer) asked by prompt_for_preferences, in order.
+    _PROMPTS = (
+        ("notifications_enabled", "Enable notifications (yes/no)", "no"),
+        ("response_style", "Response style (friendly/formal/casual)", "friendly"),
+        ("content_tone", "Content tone (neutral/positive/negative)", "neutral"),
+        ("content_frequency", "Content frequency (daily/weekly/monthly)", "daily"),
+        ("notification_method", "Notification method (email/sms/none)", "email"),
+        ("interaction_type", "Interaction type (proactive/reactive/neutral)", "neutral"),
+        ("comment_response_style", "Comment response style (friendly/formal/casual)", "friendly"),
+        ("comment_content_tone", "Comment content tone (neutral/positive/negative)", "positive"),
+        ("comment_interaction_type", "Comment interaction type (proactive/reactive/neutral)", "proactive"),
+        ("reply_response_style", "Reply response style (friendly/formal/casual)", "formal"),
+        ("reply_content_tone", "Reply content tone (neutral/positive/negative)", "neutral"),
+        ("reply_interaction_type", "Reply interaction type (proactive/reactive/neutral)", "reactive"),
+        ("tags", "Tags (comma-separated)", ""),
+        ("length", "Post length (short/medium/long)", "short"),
+        ("category", "Post category", "general"),
+        ("audience", "Audience", "general"),
+        ("language", "Language", "en"),
+        ("tone", "Tone (reserved/bold/humble)", "reserved"),
+    )
+
+    # What select_preferred_caption ignored to find a caption, by match tier.
+    _RELAXED_MATCHES = {
+        1: "ignoring tags, category, and tone",
+        2: "ignoring category and tone",
+        3: "ignoring category",
+    }
+
+    # Preferences readable as attributes, e.g. user_preferences.tone.
+    _PREFERENCE_ATTRIBUTES = frozenset(
+        ("notifications_enabled", "tags")
+        + tuple(rule[0] for rule in _VALIDATION_SCHEMA + _POST_DEFAULTS)
+    )
+
+    # Preferences whose values come from a small set of strings shared by most users.
+    _INTERNED_KEYS = tuple(rule[0] for rule in _VALIDATION_SCHEMA + _POST_DEFAULTS)
+
+    def __new__(cls, config_manager: ConfigManager, database_client: DatabaseClient, user_id: int):
+        """
+        Return the shared UserPreferences instance for user_id, creating and initializing it on first use.
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(UserPreferences, cls).__new__(cls)
-        return cls._instance
+        Initialization happens here rather than in __init__, so later constructions for the same
+        user return the existing instance without re-running any setup.
 
-    def __init__(self, config_manager: ConfigManager, database_client: DatabaseClient, user_id: int):
+        :param config_manager: An instance of ConfigManager for retrieving default settings.
+        :param database_client: An instance of DatabaseClient for interacting with the database.
+        :param user_id: The ID of the user whose preferences are being managed.
+        """
+        instance = cls._instances.get(user_id)
+        if instance is None:
+            with cls._instances_lock:
+                instance = cls._instances.get(user_id)
+                if instance is None:
+                    instance = super(UserPreferences, cls).__new__(cls)
+                    instance._init(config_manager, database_client, user_id)
+                    cls._instances[user_id] = instance
+                    return instance
+        if config_manager is not instance.config_manager or database_client is not instance.db_client:
+            instance.logger.warning(
+                "UserPreferences is already initialized for user_id %s; ignoring the new arguments.",
+                user_id
+            )
+        return instance
+
+    @classmethod
+    def instance(cls, user_id):
+        """
+        Return the shared UserPreferences instance for a user without constructing it.
+
+        :param user_id: The ID of the user whose preferences are managed by the instance.
+        :return: The shared instance.
+        :raises RuntimeError: If no instance exists for the user.
+        """
+        instance = cls._instances.get(user_id)
+        if instance is None:
+            raise RuntimeError(f"UserPreferences has not been initialized for user_id {user_id}.")
+        return instance
+
+    @classmethod
+    def flush_all(cls):
+        """
+        Write the pending preference updates of every live instance to the database.
+        """
+        for instance in list(cls._instances.values()):
+            instance.flush_preferences()
+
+    def _init(self, config_manager, database_client, user_id):
         """
         Initialize the UserPreferences class.
 
-        This constructor initializes the configuration manager and database client
+        This initializes the configuration manager and database client
         required for managing user preferences.
 
         :param config_manager: An instance of ConfigManager for retrieving default settings.
         :param database_client: An instance of DatabaseClient for interacting with the database.
         :param user_id: The ID of the user whose preferences are being managed.
         """
-        if hasattr(self, '_initialized') and self._initialized:
-            return
         self.logger = logging.getLogger(__name__)
         self.config_manager = config_manager
         self.db_client = database_client
         self.user_id = user_id
         self.preferences = {}
-        self._initialized = True
-
-        # Initialize attributes with default values or from loaded preferences
+        self._loaded_at = 0.0
+        # Validated preferences of other users, e.g. notification recipients, keyed by user ID as
+        # (preferences, loaded_at) and kept in least-recently-used order so the cache stays bounded.
+        self._user_cache = OrderedDict()
+        self._user_cache_size = config_manager.get("prefs_cache_size", 10000)
+        self._user_cache_lock = threading.Lock()
+        # Cached preferences older than this many seconds are still served, but refreshed in the background.
+        self._ttl = config_manager.get("prefs_cache_ttl", 300)
+        self._executor = _REFRESH_POOL
+        self._refreshing = set()
+        self._pending_lookups = []
+        self._flush_handle = None
+        self._flush_task = None
+        self._update_callbacks = []
+        # Updated preferences not yet written to the database, keyed by user ID.
+        self._dirty = {}
+        self._dirty_lock = threading.Lock()
+        self._flush_timer = None
+        self._tag_source = None
+        self._tag_set = frozenset()
+
+        # Load once here, on the constructing thread, so reading a preference never touches the
+        # database or prompts, whichever thread or event loop it happens on.
         self.load_preferences()
 
-        self.notifications_enabled = self.preferences.get('notifications_enabled', True)
-        self.response_style = self.preferences.get('response_style', 'friendly')
-        self.content_tone = self.preferences.get('content_tone', 'neutral')
-        self.content_frequency = self.preferences.get('content_frequency', 'daily')
-        self.notification_method = self.preferences.get('notification_method', 'email')
-        self.interaction_type = self.preferences.get('interaction_type', 'reactive')
-
-        # Additional preferences
-        self.comment_response_style = self.preferences.get('comment_response_style', 'friendly')
-        self.comment_content_tone = self.preferences.get('comment_content_tone', 'positive')
-        self.comment_interaction_type = self.preferences.get('comment_interaction_type', 'proactive')
-        self.reply_response_style = self.preferences.get('reply_response_style', 'formal')
-        self.reply_content_tone = self.preferences.get('reply_content_tone', 'neutral')
-        self.reply_interaction_type = self.preferences.get('reply_interaction_type', 'reactive')
-
-        # Post preferences
-        self.tags = self.preferences.get('tags', [])
-        self.length = self.preferences.get('length', 'short')
-        self.category = self.preferences.get('category', 'general')
-        self.audience = self.preferences.get('audience', 'general')
-        self.language = self.preferences.get('language', 'en')
-        self.tone = self.preferences.get('tone', 'reserved')
+    def __getattr__(self, name):
+        """
+        Resolve preference attributes such as tone or reply_content_tone from the preferences
+        loaded at construction.
+
+        :param name: The attribute name.
+        :return: The preference value, or its default if the preferences don't set it.
+        :raises AttributeError: If name is not a preference.
+        """
+        if name not in self._PREFERENCE_ATTRIBUTES:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        preferences = self.get_preferences()
+        return preferences[name] if name in preferences else self._defaults[name]
 
     def load_preferences(self):
         """
         Load preferences from the database or prompt the user to enter them.
         """
         try:
-            if not self.db_client.check_table_exists('user_preferences'):
-                self.logger.warning("Table 'user_preferences' does not exist. It will be created.")
-                self.db_client.create_table_user_preferences()
-
-            preferences = self.db_client.get_user_preferences(self.user_id)
-            if preferences:
-                self.preferences = self._validate_preferences(preferences[0])
-                self.logger.info(f"Loaded preferences for user_id {self.user_id}")
+            if 'user_preferences' not in self._schema_ready:
+                if not self.db_client.check_table_exists('user_preferences'):
+                    self.logger.warning("Table 'user_preferences' does not exist. It will be created.")
+                    self.db_client.create_table_user_preferences()
+                self._schema_ready.add('user_preferences')
+
+            rows = self.db_client.get_user_preferences(self.user_id)
+            if rows:
+                preferences = self._validate_stored_preferences(rows[0])
+                self.logger.info("Loaded preferences for user_id %s", self.user_id)
+            else:
+                self.logger.warning("No user preferences found for user_id: %s", self.user_id)
+                preferences = self.prompt_for_preferences()
+                self.db_client.update_user_preferences(self.user_id, preferences)
+        except Exception as e:
+            self.logger.error("Failed to load preferences: %s", e)
+            preferences = self._default_preferences()
+        self._loaded_at = time.monotonic()
+        self._set_preferences(preferences)
+
+    def refresh_preferences(self, user_id=None):
+        """
+        Re-read a user's preferences from the database, replacing the cached copy.
+
+        If the database can't be read, the cached preferences are kept as they are.
+
+        :param user_id: The user to refresh preferences for. Defaults to the managed user.
+        """
+        if user_id is None:
+            user_id = self.user_id
+        try:
+            if user_id == self.user_id:
+                rows = self.db_client.get_user_preferences(user_id)
+                # A pending write is newer than anything in the database.
+                if rows and user_id not in self._dirty:
+                    self._set_preferences(self._validate_stored_preferences(rows[0]))
+                self._loaded_at = time.monotonic()
             else:
-                self.logger.warning(f"No user preferences found for user_id: {self.user_id}")
-                self.preferences = self.prompt_for_preferences()
-                self.db_client.update_user_preferences(self.user_id, self.preferences)
+                row = self.db_client.get_user_preferences_bulk([user_id]).get(user_id)
+                preferences = self._validate_stored_preferences(dict(row)) if row else None
+                self._cache_user(user_id, self._compact_preferences(preferences))
+            self.logger.debug("Refreshed preferences for user_id %s", user_id)
         except Exception as e:
-            self.logger.error(f"Failed to load preferences: {e}")
-            self.preferences = self._default_preferences()
+            self.logger.error("Failed to refresh preferences for user_id %s, keeping cached copy: %s", user_id, e)
+        finally:
+            with self._user_cache_lock:
+                self._refreshing.discard(user_id)
+
+    def _revalidate_if_stale(self, user_id, loaded_at):
+        """
+        Schedule a background refresh of a user's preferences once they are older than the TTL.
+
+        :param user_id: The user whose cached preferences were just served.
+        :param loaded_at: When those preferences were loaded, from time.monotonic().
+        """
+        if time.monotonic() - loaded_at <= self._ttl:
+            return
+        with self._user_cache_lock:
+            if user_id in self._refreshing:
+                return
+            self._refreshing.add(user_id)
+        self._executor.submit(self.refresh_preferences, user_id)
 
     def prompt_for_preferences(self):
         """
@@ -83,36 +310,19 @@ class UserPreferences:
 
         :return: A dictionary of user preferences.
         """
-        def input_with_default(prompt, default):
-            return input(f"{prompt} [{default}]: ").strip() or default
-
         preferences = {}
-        preferences["notifications_enabled"] = input_with_default("Enable notifications (yes/no)", "no") == "yes"
-        preferences["response_style"] = input_with_default("Response style (friendly/formal/casual)", "friendly")
-        preferences["content_tone"] = input_with_default("Content tone (neutral/positive/negative)", "neutral")
-        preferences["content_frequency"] = input_with_default("Content frequency (daily/weekly/monthly)", "daily")
-        preferences["notification_method"] = input_with_default("Notification method (email/sms/none)", "email")
-        preferences["interaction_type"] = input_with_default("Interaction type (proactive/reactive/neutral)", "neutral")
-
-        # Additional preferences
-        preferences["comment_response_style"] = input_with_default("Comment response style (friendly/formal/casual)", "friendly")
-        preferences["comment_content_tone"] = input_with_default("Comment content tone (neutral/positive/negative)", "positive")
-        preferences["comment_interaction_type"] = input_with_default("Comment interaction type (proactive/reactive/neutral)", "proactive")
-        preferences["reply_response_style"] = input_with_default("Reply response style (friendly/formal/casual)", "formal")
-        preferences["reply_content_tone"] = input_with_default("Reply content tone (neutral/positive/negative)", "neutral")
-        preferences["reply_interaction_type"] = input_with_default("Reply interaction type (proactive/reactive/neutral)", "reactive")
-
-        # Post preferences
-        preferences["tags"] = input_with_default("Tags (comma-separated)", "").split(',')
-        preferences["length"] = input_with_default("Post length (short/medium/long)", "short")
-        preferences["category"] = input_with_default("Post category", "general")
-        preferences["audience"] = input_with_default("Audience", "general")
-        preferences["language"] = input_with_default("Language", "en")
-        preferences["tone"] = input_with_default("Tone (reserved/bold/humble)", "reserved")
-
-        self.logger.debug(f"User-entered preferences: {preferences}")
-
-        return self._validate_preferences(preferences)
+        for key, prompt, default in self._PROMPTS:
+            valid_values = self._ALLOWED_VALUES.get(key)
+            value = input(f"{prompt} [{default}]: ").strip() or default
+            while valid_values is not None and value not in valid_values:
+                value = input(f"Invalid value '{value}'. {prompt} [{default}]: ").strip() or default
+            preferences[key] = value
+        preferences["notifications_enabled"] = preferences["notifications_enabled"] == "yes"
+        preferences["tags"] = [tag.strip() for tag in preferences["tags"].split(',') if tag.strip()]
+
+        self.logger.debug("User-entered preferences: %s", preferences)
+
+        return self._validate_preferences(preferences, inplace=True)
 
     def select_preferred_caption(self, captions, generated_captions):
         """
@@ -129,31 +339,6 @@ class UserPreferences:
             ValueError: If no suitable captions are found.
         """
         
-        def filter_captions(captions, tags=None, length=None, category=None, tone=None):
-            """
-            Filter captions based on tags, length, category, and tone.
-
-            Args:
-                captions (list): List of captions to filter.
-                tags (list, optional): List of tags to filter by. Default is None.
-                length (str, optional): Desired length of the caption. Default is None.
-                category (str, optional): Desired category of the caption. Default is None.
-                tone (str, optional): Desired tone of the caption. Default is None.
-
-            Returns:
-                list: Filtered list of captions.
-            """
-            if tags is None:
-                tags = []
-            
-            return [
-                caption for caption in captions
-                if (not tags or any(tag.strip() in (caption.get('tags') or '').split(',') for tag in tags)) and
-                (not length or caption.get('length') == length) and
-                (not category or caption.get('category') == category) and
-                (not tone or caption.get('tone') == tone)
-            ]
-
         # Exclude already generated captions
         generated_caption_ids = {gen_caption['caption_id'] for gen_caption in generated_captions}
         captions = [caption for caption in captions if caption.get('id') not in generated_caption_ids]
@@ -162,172 +347,479 @@ class UserPreferences:
             self.logger.error("All available captions have been previously generated.")
             raise ValueError("No new captions available to select from.")
 
-        # Step 1: Try exact match
-        filtered_captions = filter_captions(captions, self.tags, self.length, self.category, self.tone)
-        
-        # Step 2: Relax criteria (ignore category)
-        if not filtered_captions:
-            self.logger.info("No exact match found, relaxing criteria (ignoring category).")
-            filtered_captions = filter_captions(captions, self.tags, self.length, None, self.tone)
-        
-        # Step 3: Further relax criteria (ignore category and tone)
-        if not filtered_captions:
-            self.logger.info("Still no match, further relaxing criteria (ignoring category and tone).")
-            filtered_captions = filter_captions(captions, self.tags, self.length, None, None)
-        
-        # Step 4: Broadest match (ignore tags, category, and tone)
-        if not filtered_captions:
-            self.logger.info("No match found, using broadest criteria (ignoring tags, category, and tone).")
-            filtered_captions = filter_captions(captions, None, self.length, None, None)
-        
-        # Step 5: If still no match, return the first available caption
-        if not filtered_captions:
+        # Score every caption in one pass. Length must always match; after that, captions matching
+        # the tags, tone and category rank highest, then those ignoring category, then those also
+        # ignoring tone, then those ignoring tags. Within a tier the most engaging caption wins.
+        preferred_tags = self._preferred_tag_set()
+        selected_caption = None
+        best_rank = None
+        for caption in captions:
+            if self.length and caption.get('length') != self.length:
+                continue
+            tags, engagement = caption_features(caption)
+            if preferred_tags and preferred_tags.isdisjoint(tags):
+                tier = 1
+            elif self.tone and caption.get('tone') != self.tone:
+                tier = 2
+            elif self.category and caption.get('category') != self.category:
+                tier = 3
+            else:
+                tier = 4
+            rank = (tier, engagement)
+            if best_rank is None or rank > best_rank:
+                selected_caption = caption
+                best_rank = rank
+
+        if selected_caption is None:
             self.logger.info("No filtered captions found. Falling back to the first available caption.")
-            filtered_captions = [captions[0]]
-
-        # Rank captions by engagement or other metrics
-        ranked_captions = sorted(
-            filtered_captions,
-            key=lambda c: (c.get('likes', 0) + c.get('shares', 0) + c.get('comments', 0)),
-            reverse=True
-        )
-        
-        # Select the top-ranked caption
-        selected_caption = ranked_captions[0]
-        
-        self.logger.info(f"Selected caption text: {selected_caption.get('caption_text')}")
+            selected_caption = captions[0]
+        elif best_rank[0] < 4:
+            self.logger.info("No exact match found, relaxed criteria to: %s.", self._RELAXED_MATCHES[best_rank[0]])
+
+        self.logger.info("Selected caption text: %s", selected_caption.get('caption_text'))
         return selected_caption
 
 
 
+    def _preferred_tag_set(self):
+        """
+        Return the preferred tags as a normalized set, rebuilt only when the tags change.
+
+        :return: A frozenset of stripped, non-empty tags.
+        """
+        tags = self.tags
+        if tags is not self._tag_source:
+            self._tag_set = frozenset(tag.strip() for tag in tags or () if tag.strip())
+            self._tag_source = tags
+        return self._tag_set
+
     def update_user_preferences(self):
         """
         Update the user's preferences in the database.
         """
         try:
             self.db_client.update_user_preferences(self.user_id, self.preferences)
-            self.logger.info(f"Preferences updated for user_id {self.user_id}")
+            self._loaded_at = time.monotonic()
+            self.logger.info("Preferences updated for user_id %s", self.user_id)
         except Exception as e:
-            self.logger.error(f"Failed to update preferences: {e}")
+            self.logger.error("Failed to update preferences: %s", e)
 
-    def get_preferences(self):
+    def invalidate(self, user_id=None):
         """
-        Retrieve preferences, loading them if not already in memory.
+        Discard a user's cached preferences after they were written to the database outside of
+        this class. The managed user's preferences are re-read right away; other users' are
+        read on their next lookup. Pending updates for the user are written first so they aren't lost.
 
-        :return: A dictionary of user preferences.
+        :param user_id: The user whose preferences changed. Defaults to the managed user.
+        """
+        if user_id is None:
+            user_id = self.user_id
+        if user_id in self._dirty:
+            self.flush_preferences()
+        if user_id == self.user_id:
+            self.refresh_preferences()
+        else:
+            with self._user_cache_lock:
+                self._user_cache.pop(user_id, None)
+        self.logger.debug("Invalidated cached preferences for user_id %s", user_id)
+
+    def get_preferences(self, user_id=None):
         """
-        if not self.preferences:
-            self.load_preferences()
+        Retrieve preferences from memory. The managed user's preferences are loaded at
+        construction; other users' are loaded on first lookup and then cached.
+
+        :param user_id: The user to retrieve preferences for. Defaults to the managed user.
+        :return: A dictionary of user preferences; read-only for users other than the managed user.
+        """
+        if user_id is not None and user_id != self.user_id:
+            preferences = self._get_cached_user(user_id)
+            if preferences is None:
+                preferences = self.load_preferences_many((user_id,))[user_id]
+            return preferences
+
+        # Check the age inline; calling _revalidate_if_stale on every hit costs more than the check.
+        if time.monotonic() - self._loaded_at > self._ttl:
+            self._revalidate_if_stale(self.user_id, self._loaded_at)
         return self.preferences
 
+    def get_preferences_many(self, user_ids):
+        """
+        Retrieve the preferences of several users, loading any not yet in memory in one database query.
+
+        :param user_ids: The IDs of the users to retrieve preferences for.
+        :return: A dictionary mapping each user ID to its preferences.
+        """
+        loaded = self.load_preferences_many(user_ids)
+        return {
+            user_id: self.get_preferences() if user_id == self.user_id else loaded[user_id]
+            for user_id in user_ids
+        }
+
+    async def aget_preferences(self, user_id):
+        """
+        Retrieve a user's preferences from a coroutine, coalescing concurrent lookups.
+
+        Lookups for uncached users made within COALESCE_DELAY of each other are answered by a
+        single bulk database query run off the event loop.
+
+        :param user_id: The user to retrieve preferences for.
+        :return: A dictionary of user preferences.
+        """
+        if user_id == self.user_id:
+            return self.get_preferences()
+        cached = self._get_cached_user(user_id)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_lookups.append((user_id, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.COALESCE_DELAY, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self):
+        """
+        Start flushing the pending lookups; called by the event loop once the coalescing delay expires.
+        """
+        self._flush_handle = None
+        pending, self._pending_lookups = self._pending_lookups, []
+        # Keep a reference so the task isn't garbage collected while it runs.
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_lookups(pending))
+
+    async def _flush_lookups(self, pending):
+        """
+        Answer a batch of pending lookups with one bulk load.
+
+        :param pending: A list of (user_id, future) pairs to resolve.
+        """
+        try:
+            loaded = await asyncio.to_thread(self.load_preferences_many, [user_id for user_id, _ in pending])
+        except Exception as e:
+            self.logger.error("Failed to load preferences for %s users: %s", len(pending), e)
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for user_id, future in pending:
+            if not future.done():
+                future.set_result(loaded[user_id])
+
+    def load_preferences_many(self, user_ids):
+        """
+        Load and validate the preferences of several other users with a single database query.
+
+        Users without stored preferences get the defaults; they are never prompted. Only the
+        values that differ from the defaults are kept per user, see _compact_preferences().
+
+        :param user_ids: The IDs of the users to load preferences for.
+        :return: A dictionary mapping each requested user ID, other than the managed user, to its preferences.
+        :raises Exception: If the database can't be read; nothing is cached for the missing users.
+        """
+        loaded = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id == self.user_id:
+                continue
+            preferences = self._get_cached_user(user_id)
+            if preferences is None:
+                missing.append(user_id)
+            else:
+                loaded[user_id] = preferences
+        if not missing:
+            return loaded
+
+        rows = self.db_client.get_user_preferences_bulk(missing)
+        stored = {user_id: dict(rows[user_id]) for user_id in missing if rows.get(user_id)}
+        self._validate_stored_many(list(stored.values()))
+        for user_id in missing:
+            preferences = self._compact_preferences(stored.get(user_id))
+            self._cache_user(user_id, preferences)
+            loaded[user_id] = preferences
+        self.logger.info("Loaded preferences for %s users", len(missing))
+        return loaded
+
+    def prewarm(self, user_ids):
+        """
+        Load the preferences of users expected to be active, in the background, so their first
+        lookup is served from the cache.
+
+        :param user_ids: The IDs of the users to load preferences for.
+        :return: A Future resolving to the loaded preferences, keyed by user ID.
+        """
+        self.logger.info("Prewarming preferences for %s users", len(user_ids))
+        return self._executor.submit(self.load_preferences_many, user_ids)
+
+    def _compact_preferences(self, preferences):
+        """
+        Reduce another user's validated preferences to the values that differ from the defaults.
+
+        The shared defaults back every cached user, so users who kept most defaults cost
+        next to nothing to cache and users with no stored row share the defaults outright.
+
+        :param preferences: The user's validated preferences, or None if they have none stored.
+        :return: A read-only mapping of the user's preferences.
+        """
+        defaults = self._defaults
+        if not preferences:
+            return defaults
+        overrides = {key: value for key, value in preferences.items()
+                     if key not in defaults or value != defaults[key]}
+        # An empty tag list means the same as the default empty tuple.
+        if "tags" in overrides and not overrides["tags"]:
+            del overrides["tags"]
+        return MappingProxyType(ChainMap(overrides, defaults)) if overrides else defaults
+
+    def _get_cached_user(self, user_id):
+        """
+        Return another user's cached preferences, marking them as recently used.
+
+        Stale preferences are still returned; a background refresh is scheduled for them.
+
+        :param user_id: The user to look up.
+        :return: The cached preferences, or None if the user is not cached.
+        """
+        with self._user_cache_lock:
+            try:
+                self._user_cache.move_to_end(user_id)
+            except KeyError:
+                return None
+            preferences, loaded_at = self._user_cache[user_id]
+        if time.monotonic() - loaded_at > self._ttl:
+            self._revalidate_if_stale(user_id, loaded_at)
+        return preferences
+
+    def _cache_user(self, user_id, preferences):
+        """
+        Cache another user's preferences, evicting the least recently used user once the cache is full.
+
+        :param user_id: The user the preferences belong to.
+        :param preferences: The validated preferences to cache.
+        """
+        with self._user_cache_lock:
+            self._user_cache[user_id] = (preferences, time.monotonic())
+            self._user_cache.move_to_end(user_id)
+            if len(self._user_cache) > self._user_cache_size:
+                self._user_cache.popitem(last=False)
+
     def update_preferences(self, new_preferences):
         """
-        Update the user's preferences in the database and in memory.
+        Update the user's preferences in memory and write them to the database.
+
+        The write happens before returning unless WRITE_BACK_DELAY is set; then it happens that
+        many seconds later, so a burst of updates results in a single database write.
 
         :param new_preferences: A dictionary of new preferences to be updated.
         """
         try:
             validated_preferences = self._validate_preferences(new_preferences)
-            self.db_client.update_user_preferences(self.user_id, validated_preferences)
-            self.preferences = validated_preferences
-            self.logger.info(f"Updated preferences to {validated_preferences}")
+            self._loaded_at = time.monotonic()
+            with self._dirty_lock:
+                self._dirty[self.user_id] = validated_preferences
+                if self.WRITE_BACK_DELAY and self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.WRITE_BACK_DELAY, self.flush_preferences)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            if not self.WRITE_BACK_DELAY:
+                self.flush_preferences()
+            self._publish_update(validated_preferences)
+            self.logger.info("Updated preferences to %s", validated_preferences)
+            self._set_preferences(validated_preferences)
         except Exception as e:
-            self.logger.error(f"Failed to update preferences: {e}")
+            self.logger.error("Failed to update preferences: %s", e)
+
+    def _publish_update(self, preferences):
+        """
+        Replace the copies of this user's preferences cached by other users' instances, so they
+        see the update without reading it back from the database.
+
+        :param preferences: The managed user's updated preferences.
+        """
+        for instance in list(self._instances.values()):
+            if instance is self:
+                continue
+            with instance._user_cache_lock:
+                cached = self.user_id in instance._user_cache
+            if cached:
+                instance._cache_user(self.user_id, instance._compact_preferences(preferences))
+                self.logger.debug("Updated cached preferences of user_id %s held for user_id %s",
+                                  self.user_id, instance.user_id)
+
+    def flush_preferences(self):
+        """
+        Write any pending preference updates to the database now, one write per user.
+        """
+        with self._dirty_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            dirty, self._dirty = self._dirty, {}
+
+        for user_id, preferences in dirty.items():
+            try:
+                self.db_client.update_user_preferences(user_id, preferences)
+            except Exception as e:
+                self.logger.error("Failed to write preferences for user_id %s: %s", user_id, e)
+
+    def register_update_callback(self, callback):
+        """
+        Register a callable to be notified whenever the preferences are replaced, whether
+        loaded, refreshed from the database, invalidated or updated.
+
+        :param callback: A callable receiving the new preferences dictionary.
+        """
+        self._update_callbacks.append(callback)
+
+    def _set_preferences(self, preferences):
+        """
+        Replace the managed user's preferences and notify the registered callbacks.
+
+        :param preferences: The validated preferences to use from now on.
+        """
+        self.preferences = preferences
+        for callback in self._update_callbacks:
+            callback(preferences)
 
     def _default_preferences(self):
         """
-        Return the default preferences from ConfigManager.
+        Return a fresh copy of the default preferences from ConfigManager.
 
         :return: A dictionary of default preferences.
         """
-        return {
-            "notifications_enabled": self.config_manager.get("default_notifications_enabled", True),
-            "response_style": self.config_manager.get("default_response_style", "friendly"),
-            "content_tone": self.config_manager.get("default_content_tone", "neutral"),
-            "content_frequency": self.config_manager.get("default_content_frequency", "daily"),
-            "notification_method": self.config_manager.get("default_notification_method", "email"),
-            "interaction_type": self.config_manager.get("default_interaction_type", "reactive"),
-            "comment_response_style": self.config_manager.get("default_comment_response_style", "friendly"),
-            "comment_content_tone": self.config_manager.get("default_comment_content_tone", "positive"),
-            "comment_interaction_type": self.config_manager.get("default_comment_interaction_type", "proactive"),
-            "reply_response_style": self.config_manager.get("default_reply_response_style", "formal"),
-            "reply_content_tone": self.config_manager.get("default_reply_content_tone", "neutral"),
-            "reply_interaction_type": self.config_manager.get("default_reply_interaction_type", "reactive"),
-            "tags": [],
-            "length": "short",
-            "category": "general",
-            "audience": "general",
-            "language": "en",
-            "tone": "reserved"
-        }
+        preferences = dict(self._defaults)
+        preferences["tags"] = list(preferences["tags"])
+        return preferences
 
-    def _validate_preferences(self, preferences):
+    def refresh_defaults(self):
         """
-        Validate and sanitize user preferences to ensure they conform to expected values.
+        Discard the cached defaults so they are read from ConfigManager again on next use.
 
-        :param preferences: A dictionary of preferences to validate.
-        :return: A sanitized dictionary of preferences.
+        Other users' cached preferences are layered over the defaults, so they are discarded too.
+        """
+        self._defaults_memo.pop(self.config_manager, None)
+        self.__dict__.pop("_defaults", None)
+        self.__dict__.pop("_validation_rules", None)
+        with self._user_cache_lock:
+            self._user_cache.clear()
+
+    @cached_property
+    def _defaults(self):
         """
-        if "notifications_enabled" not in preferences:
-            preferences["notifications_enabled"] = self.config_manager.get("default_notifications_enabled", True)
+        The default preferences, read from ConfigManager once since they don't change at runtime.
 
-        valid_response_styles = ["friendly", "formal", "casual"]
-        if preferences.get("response_style") not in valid_response_styles:
-            self.logger.warning(f"Invalid response style: {preferences.get('response_style')}, setting to default.")
-            preferences["response_style"] = self.config_manager.get("default_response_style", "friendly")
+        The mapping is read-only and shared by all instances using the same ConfigManager; use
+        _default_preferences() for a mutable copy.
+        """
+        memoized = self._defaults_memo.get(self.config_manager)
+        if memoized is not None:
+            return memoized
+
+        config_get = self.config_manager.get
+        defaults = {"notifications_enabled": config_get("default_notifications_enabled", True)}
+        for key, _, config_key, fallback in self._VALIDATION_SCHEMA:
+            defaults[key] = config_get(config_key, fallback)
+        defaults["tags"] = ()
+        defaults.update(self._POST_DEFAULTS)
+        memoized = self._defaults_memo[self.config_manager] = MappingProxyType(defaults)
+        return memoized
+
+    def _validate_stored_preferences(self, preferences):
+        """
+        Validate preferences loaded from the database, unless they were already validated
+        under the current SCHEMA_VERSION when they were written.
+
+        :param preferences: A dictionary of preferences loaded from the database.
+        :return: A sanitized dictionary of preferences.
+        """
+        return self._validate_stored_many((preferences,))[0]
 
-        valid_content_tones = ["neutral", "positive", "negative"]
-        if preferences.get("content_tone") not in valid_content_tones:
-            self.logger.warning(f"Invalid content tone: {preferences.get('content_tone')}, setting to default.")
-            preferences["content_tone"] = self.config_manager.get("default_content_tone", "neutral")
+    def _validate_stored_many(self, rows):
+        """
+        Validate several preference rows loaded from the database in one pass, skipping the
+        rows already validated under the current SCHEMA_VERSION.
 
-        valid_content_frequencies = ["daily", "weekly", "monthly"]
-        if preferences.get("content_frequency") not in valid_content_frequencies:
-            self.logger.warning(f"Invalid content frequency: {preferences.get('content_frequency')}, setting to default.")
-            preferences["content_frequency"] = self.config_manager.get("default_content_frequency", "daily")
+        :param rows: A sequence of preference dictionaries loaded from the database, updated in place.
+        :return: The same sequence.
+        """
+        stale = []
+        for preferences in rows:
+            if preferences.get("schema_version") == SCHEMA_VERSION:
+                self._intern_values(preferences)
+            else:
+                stale.append(preferences)
+        if stale:
+            self._validate_many(stale)
+        return rows
 
-        valid_notification_methods = ["email", "sms", "none"]
-        if preferences.get("notification_method") not in valid_notification_methods:
-            self.logger.warning(f"Invalid notification method: {preferences.get('notification_method')}, setting to default.")
-            preferences["notification_method"] = self.config_manager.get("default_notification_method", "email")
+    def _intern_values(self, preferences):
+        """
+        Replace enum-like string values with their interned copies, so every cached user
+        shares one string object per value instead of holding fresh ones from each database read.
 
-        valid_interaction_types = ["proactive", "reactive", "neutral"]
-        if preferences.get("interaction_type") not in valid_interaction_types:
-            self.logger.warning(f"Invalid interaction type: {preferences.get('interaction_type')}, setting to default.")
-            preferences["interaction_type"] = self.config_manager.get("default_interaction_type", "reactive")
+        :param preferences: A dictionary of preferences, updated in place.
+        :return: The same dictionary.
+        """
+        for key in self._INTERNED_KEYS:
+            value = preferences.get(key)
+            if type(value) is str:
+                preferences[key] = sys.intern(value)
+        return preferences
 
-        # Validate specific comment preferences
-        if preferences.get("comment_response_style") not in valid_response_styles:
-            self.logger.warning(f"Invalid comment response style: {preferences.get('comment_response_style')}, setting to default.")
-            preferences["comment_response_style"] = self.config_manager.get("default_comment_response_style", "friendly")
+    @cached_property
+    def _validation_rules(self):
+        """
+        The validation schema as (key, allowed values, default) triples, with the defaults
+        resolved once instead of looked up on every validation.
+        """
+        defaults = self._defaults
+        return tuple((key, valid_values, defaults[key]) for key, valid_values, _, _ in self._VALIDATION_SCHEMA)
 
-        if preferences.get("comment_content_tone") not in valid_content_tones:
-            self.logger.warning(f"Invalid comment content tone: {preferences.get('comment_content_tone')}, setting to default.")
-            preferences["comment_content_tone"] = self.config_manager.get("default_comment_content_tone", "positive")
+    def _validate_preferences(self, preferences, *, inplace=False):
+        """
+        Validate and sanitize user preferences to ensure they conform to expected values.
 
-        if preferences.get("comment_interaction_type") not in valid_interaction_types:
-            self.logger.warning(f"Invalid comment interaction type: {preferences.get('comment_interaction_type')}, setting to default.")
-            preferences["comment_interaction_type"] = self.config_manager.get("default_comment_interaction_type", "proactive")
+        :param preferences: A dictionary of preferences to validate.
+        :param inplace: Sanitize the given dictionary itself instead of a copy. Only pass True
+            for dictionaries this class owns, such as rows it just loaded or built.
+        :return: A sanitized dictionary of preferences.
+        """
+        if not inplace:
+            preferences = dict(preferences)
+        return self._validate_many((preferences,))[0]
 
-        # Validate specific reply preferences
-        if preferences.get("reply_response_style") not in valid_response_styles:
-            self.logger.warning(f"Invalid reply response style: {preferences.get('reply_response_style')}, setting to default.")
-            preferences["reply_response_style"] = self.config_manager.get("default_reply_response_style", "formal")
+    def _validate_many(self, rows):
+        """
+        Validate and sanitize several preference dictionaries at once.
 
-        if preferences.get("reply_content_tone") not in valid_content_tones:
-            self.logger.warning(f"Invalid reply content tone: {preferences.get('reply_content_tone')}, setting to default.")
-            preferences["reply_content_tone"] = self.config_manager.get("default_reply_content_tone", "neutral")
+        Rules form the outer loop, so each rule's allowed values and default are looked up
+        once per batch rather than once per row.
 
-        if preferences.get("reply_interaction_type") not in valid_interaction_types:
-            self.logger.warning(f"Invalid reply interaction type: {preferences.get('reply_interaction_type')}, setting to default.")
-            preferences["reply_interaction_type"] = self.config_manager.get("default_reply_interaction_type", "reactive")
+        :param rows: A sequence of preference dictionaries, updated in place.
+        :return: The same sequence.
+        """
+        defaults = self._defaults
+        notifications_enabled = defaults["notifications_enabled"]
+        for preferences in rows:
+            if "notifications_enabled" not in preferences:
+                preferences["notifications_enabled"] = notifications_enabled
+
+        for key, valid_values, default in self._validation_rules:
+            for preferences in rows:
+                value = preferences.get(key)
+                if value not in valid_values:
+                    self.logger.warning("Invalid %s: %s, setting to default.", key.replace("_", " "), value)
+                    preferences[key] = default
 
         # Validate post preferences
-        preferences["tags"] = preferences.get("tags", [])
-        preferences["length"] = preferences.get("length", "short")
-        preferences["category"] = preferences.get("category", "general")
-        preferences["audience"] = preferences.get("audience", "general")
-        preferences["language"] = preferences.get("language", "en")
-        preferences["tone"] = preferences.get("tone", "reserved")
-
-        return preferences
+        for preferences in rows:
+            if "tags" not in preferences:
+                preferences["tags"] = []
+            for key, default in self._POST_DEFAULTS:
+                if key not in preferences:
+                    preferences[key] = default
+            preferences["schema_version"] = SCHEMA_VERSION
+            self._intern_values(preferences)
+        return rows
+
+# Registered once for the class; a per-instance registration would keep every instance alive.
+atexit.register(UserPreferences.flush_all)
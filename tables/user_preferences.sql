@@ -19,6 +19,7 @@ CREATE TABLE user_preferences (
     tone VARCHAR(20) DEFAULT 'reserved',
     audience VARCHAR(50) DEFAULT 'general',
     language VARCHAR(10) DEFAULT 'en',
+    schema_version INT DEFAULT 0,  -- Validation rules version the row was last validated under
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
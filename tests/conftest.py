@@ -0,0 +1,155 @@
+"""
+Shared pytest fixtures.
+
+Spec'd MagicMocks introspect their spec class when built, so they are created once per
+test module and reset between tests instead of being rebuilt in every test. They use
+spec_set where possible, so a test can't configure a method the real class doesn't have. The bot
+modules are imported inside the fixtures so collecting unrelated tests doesn't import them.
+"""
+import json
+import pytest
+from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import MagicMock
+from tests.fakes import FakeConfigManager, StubPlatform
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Successful Instagram results returned by stub_instagram; read-only so no test can alter them for the others.
+INSTAGRAM_RESULTS = {
+    "post_image": MappingProxyType({"status": "success", "url": "https://www.instagram.com/p/post_id/"}),
+    "post_comment": MappingProxyType({"status": "success", "id": "comment_id"}),
+    "reply_to_comment": MappingProxyType({"status": "success", "id": "reply_id"}),
+}
+
+# Values served by mock_config_manager; each suite only reads its own keys.
+CONFIG_VALUES = {
+    "instagram_api_key": "test-api-key",
+    "instagram_access_token": "test-access-token",
+    "openai_api_key": "test-api-key",
+    "openai_engine": "davinci",
+}
+
+
+@pytest.fixture(scope="module")
+def mock_config_manager():
+    """A fake ConfigManager serving CONFIG_VALUES."""
+    return FakeConfigManager(CONFIG_VALUES)
+
+
+@pytest.fixture
+def instagram_integration(mock_config_manager):
+    """An InstagramIntegration using the Graph API and the mocked configuration."""
+    from bot.social_media.instagram_api import InstagramIntegration
+
+    return InstagramIntegration(mock_config_manager)
+
+
+@pytest.fixture
+def mock_responses():
+    """
+    A RequestsMock intercepting every request sent through a requests session.
+
+    It patches the transport adapter rather than the session, so the pooled session shared by
+    the integrations keeps working; tests register the endpoints they expect to be called.
+    """
+    import responses
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture(scope="module")
+def instagram_responses():
+    """Canned Instagram API payloads, keyed by scenario, read once per module."""
+    return json.loads((DATA_DIR / "instagram_responses.json").read_bytes())
+
+
+@pytest.fixture
+def openai_client(mock_config_manager, mock_user_preferences):
+    """An OpenAIClient using the mocked configuration and user preferences."""
+    # Imported the way the bot imports it, so patches of the openai_client module apply.
+    from openai_client import OpenAIClient
+
+    return OpenAIClient(mock_config_manager, mock_user_preferences)
+
+
+@pytest.fixture(scope="module")
+def mock_openai_client():
+    """An OpenAIClient mock; reset for each test by the response_generator fixture."""
+    from bot.openai_client import OpenAIClient
+
+    return MagicMock(spec_set=OpenAIClient)
+
+
+@pytest.fixture(scope="module")
+def mock_database_client():
+    """A DatabaseClient mock; reset for each test by the response_generator fixture."""
+    from bot.database_client import DatabaseClient
+
+    return MagicMock(spec_set=DatabaseClient)
+
+
+@pytest.fixture(scope="module")
+def mock_user_preferences():
+    """
+    A UserPreferences mock; reset for each test by the response_generator fixture.
+
+    Unlike the other shared mocks it is spec'd without spec_set: preference attributes such as
+    response_style are resolved dynamically rather than defined on the class, so tests set them.
+    """
+    from bot.user_preferences import UserPreferences
+
+    return MagicMock(spec=UserPreferences)
+
+
+@pytest.fixture
+def response_generator(mock_openai_client, mock_database_client, mock_user_preferences):
+    """A ResponseGenerator built on freshly reset dependency mocks."""
+    from bot.response_generator import ResponseGenerator
+
+    for mock in (mock_openai_client, mock_database_client, mock_user_preferences):
+        mock.reset_mock(return_value=True, side_effect=True)
+    return ResponseGenerator(mock_openai_client, mock_database_client, mock_user_preferences)
+
+
+@pytest.fixture
+def stub_instagram():
+    """An Instagram integration stub answering every call the bot makes successfully."""
+    return StubPlatform(**INSTAGRAM_RESULTS, fetch_post_content={}, fetch_comments_list=[])
+
+
+@pytest.fixture(scope="module")
+def mock_response_generator():
+    """
+    A ResponseGenerator mock producing a test caption, image URL and comment; the social_bot fixture
+    clears its calls and side effects for each test but keeps these return values.
+    """
+    from bot.response_generator import ResponseGenerator
+
+    response_generator = MagicMock(spec_set=ResponseGenerator)
+    response_generator.generate_caption.return_value = "Test Caption"
+    response_generator.generate_image.return_value = "http://example.com/image.jpg"
+    response_generator.generate_personalized_comment.return_value = "Test Comment"
+    return response_generator
+
+
+@pytest.fixture(scope="module")
+def shared_social_bot(mock_config_manager, mock_openai_client, mock_database_client, mock_user_preferences):
+    """An interactive SocialBot built once per module; use social_bot to get it reset for a test."""
+    from bot.bot import SocialBot
+
+    return SocialBot(mock_config_manager, mock_openai_client, mock_database_client, mock_user_preferences, interactive=True)
+
+
+@pytest.fixture
+def social_bot(shared_social_bot, mock_openai_client, mock_database_client, mock_user_preferences,
+               mock_response_generator, stub_instagram):
+    """The shared SocialBot posting to stub_instagram, with freshly reset dependency mocks and no cached captions."""
+    for mock in (mock_openai_client, mock_database_client, mock_user_preferences):
+        mock.reset_mock(return_value=True, side_effect=True)
+    mock_response_generator.reset_mock(side_effect=True)
+    shared_social_bot.platforms['instagram'] = stub_instagram
+    shared_social_bot.response_generator = mock_response_generator
+    shared_social_bot._captions_cache = None
+    return shared_social_bot
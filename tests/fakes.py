@@ -0,0 +1,55 @@
+"""
+Lightweight stand-ins for the bot's collaborators.
+
+A spec'd MagicMock introspects the real class and builds child mocks on access, which is
+wasted work for dependencies that only need to answer a few calls.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+# eq=False keeps identity hashing, so a fake can key caches such as UserPreferences' defaults memo.
+@dataclass(eq=False)
+class FakeConfigManager:
+    """A ConfigManager serving values from a dict and counting the keys it is asked for."""
+
+    values: dict = field(default_factory=dict)
+    calls: Counter = field(default_factory=Counter)
+
+    def get(self, key, default=None):
+        """
+        Return the configured value for a key.
+
+        :param key: The configuration key to look up.
+        :param default: The value returned when the key is not configured.
+        :return: The configured value, or the default.
+        """
+        self.calls[key] += 1
+        return self.values.get(key, default)
+
+
+class StubPlatform:
+    """
+    A social media integration answering each method with a canned response.
+
+    Responses are keyed by method name; an exception instance is raised instead of returned.
+    Calls are recorded in order as (name, args, kwargs) tuples.
+    """
+
+    def __init__(self, **responses):
+        self.responses = responses
+        self.calls = []
+
+    def __getattr__(self, name):
+        # Look responses up through __dict__ so copies made before __init__ runs don't recurse.
+        if name not in self.__dict__.get('responses', ()):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            response = self.responses[name]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        return method
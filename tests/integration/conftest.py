@@ -0,0 +1,25 @@
+"""
+Fixtures for the live API integration tests.
+"""
+import os
+import pytest
+
+# Credentials the live tests need; the tests are skipped when any is missing.
+REQUIRED_VARS = ('instagram_api_key', 'instagram_access_token')
+
+
+@pytest.fixture(scope="session")
+def env_config():
+    """
+    The .env settings overlaid with the process environment, parsed once per session.
+
+    dotenv_values returns a dict without touching os.environ; ConfigManager still loads
+    the .env file itself when the bot is built.
+    """
+    from dotenv import dotenv_values
+
+    config = {**dotenv_values(".env"), **os.environ}
+    missing = [var for var in REQUIRED_VARS if not config.get(var)]
+    if missing:
+        pytest.skip(f"Missing required environment variables: {', '.join(missing)}")
+    return config
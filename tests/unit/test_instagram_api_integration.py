@@ -1,92 +1,154 @@
-import unittest
-from unittest.mock import MagicMock, patch
-from bot.social_media.instagram_api import InstagramIntegration
-from bot.config_manager import ConfigManager
+"""Tests for the InstagramIntegration class."""
+import pytest
+from unittest.mock import MagicMock
+from bot.social_media.instagram_api import _POOL, InstagramIntegration
 from requests.exceptions import RequestException
 
-class TestInstagramIntegration(unittest.TestCase):
-    """Test suite for the InstagramIntegration class."""
-
-    def setUp(self):
-        """Set up the test environment by mocking ConfigManager and initializing InstagramIntegration."""
-        # Mocking the ConfigManager
-        self.mock_config_manager = MagicMock(spec=ConfigManager)
-        self.mock_config_manager.get.side_effect = lambda key, default=None: {
-            "instagram_api_key": "test-api-key",
-            "instagram_access_token": "test-access-token"
-        }.get(key, default)
-        
-        self.instagram_integration = InstagramIntegration(self.mock_config_manager)
-
-    def test_initialization_graph_api(self):
-        """Test initialization using the Graph API."""
-        self.assertEqual(self.instagram_integration.base_url, "https://graph.instagram.com/")
-        self.assertEqual(self.instagram_integration.access_token, "test-access-token")
-        self.assertIn('Authorization', self.instagram_integration.session.headers)
-        self.assertEqual(self.instagram_integration.session.headers['Authorization'], 'Bearer test-access-token')
-
-    def test_initialization_basic_display_api(self):
-        """Test initialization using the Basic Display API."""
-        instagram_integration = InstagramIntegration(self.mock_config_manager, use_graph_api=False)
-        self.assertEqual(instagram_integration.base_url, "https://api.instagram.com/v1")
-        self.assertEqual(instagram_integration.access_token, None)
-        self.assertIn('Authorization', instagram_integration.session.headers)
-        self.assertEqual(instagram_integration.session.headers['Authorization'], 'Bearer test-api-key')
-
-    @patch('requests.Session.post')
-    def test_post_image_success(self, mock_post):
-        """Test successful image posting to Instagram."""
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"id": "test-post-id"}
-
-        result = self.instagram_integration.post_image("http://example.com/image.jpg", "Test caption")
-        
-        # Assert that the POST request was made to the correct URL with the correct data
-        mock_post.assert_called_once()
-        self.assertIn("test-post-id", result["id"])
-
-    @patch('requests.Session.post', side_effect=RequestException("Failed to post image"))
-    def test_post_image_failure(self, mock_post):
-        """Test failure scenario when posting an image to Instagram."""
-        with self.assertRaises(Exception) as context:
-            self.instagram_integration.post_image("http://example.com/image.jpg", "Test caption")
-        
-        self.assertIn("Failed to post image", str(context.exception))
-        
-    @patch('requests.Session.post')
-    def test_post_image_empty_caption(self, mock_post):
-        """Test posting an image with an empty caption."""
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"id": "test-post-id"}
-
-        result = self.instagram_integration.post_image("http://example.com/image.jpg", "")
-        mock_post.assert_called_once()
-        self.assertEqual(result["id"], "test-post-id")
-
-    @patch('requests.Session.get')
-    def test_get_posts_success(self, mock_get):
-        """Test successful retrieval of posts by hashtag."""
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = {"data": [{"id": "post1"}, {"id": "post2"}]}
-
-        result = self.instagram_integration.get_posts("testhashtag")
-        
-        # Assert the correct API endpoint was called
-        mock_get.assert_called_once()
-        self.assertEqual(len(result), 2)
-
-    @patch('requests.Session.get', side_effect=RequestException("Failed to retrieve posts"))
-    def test_get_posts_failure(self, mock_get):
-        """Test failure scenario when retrieving posts by hashtag."""
-        with self.assertRaises(Exception) as context:
-            self.instagram_integration.get_posts("testhashtag")
-        self.assertIn("Failed to retrieve posts", str(context.exception))
-
-    @patch('requests.Session.get')
-    def test_get_posts_empty_hashtag(self, mock_get):
-        """Test retrieving posts with an empty hashtag."""
-        with self.assertRaises(ValueError):
-            self.instagram_integration.get_posts("")
-
-if __name__ == '__main__':
-    unittest.main()
+GRAPH_URL = "https://graph.instagram.com/"
+
+
+def register_post_image(mock_responses, instagram_responses, **response):
+    """Register the media upload and publish endpoints, both answering with `response`."""
+    return [
+        mock_responses.post(f"{GRAPH_URL}me/media", **response),
+        mock_responses.post(f"{GRAPH_URL}me/media_publish", **response),
+    ]
+
+
+def register_get_posts(mock_responses, instagram_responses, **response):
+    """Register the user, hashtag search and recent media endpoints; returns the recent media one."""
+    mock_responses.get(f"{GRAPH_URL}me", json=instagram_responses["me"])
+    mock_responses.get(f"{GRAPH_URL}ig_hashtag_search", json=instagram_responses["ig_hashtag_search"])
+    return mock_responses.get(f"{GRAPH_URL}test-hashtag-id/recent_media", **response)
+
+
+@pytest.mark.smoke
+def test_initialization_graph_api(instagram_integration):
+    """Test initialization using the Graph API."""
+    assert instagram_integration.base_url == "https://graph.instagram.com/"
+    assert instagram_integration.access_token == "test-access-token"
+    assert instagram_integration.headers['Authorization'] == 'Bearer test-access-token'
+
+
+@pytest.mark.smoke
+def test_initialization_basic_display_api(mock_config_manager, instagram_integration):
+    """Test initialization using the Basic Display API."""
+    basic_display = InstagramIntegration(mock_config_manager, use_graph_api=False)
+    assert basic_display.base_url == "https://api.instagram.com/v1"
+    assert basic_display.access_token is None
+    assert basic_display.headers['Authorization'] == 'Bearer test-api-key'
+    # Credentials are per instance; the pooled session is shared and carries none.
+    assert basic_display.session is instagram_integration.session
+    assert 'Authorization' not in basic_display.session.headers
+
+
+@pytest.mark.parametrize("caption", ["Test caption", ""])
+def test_post_image_success(instagram_integration, mock_responses, instagram_responses, caption):
+    """Test successful image posting to Instagram, with and without a caption."""
+    upload, publish = register_post_image(mock_responses, instagram_responses, json=instagram_responses["post_image_success"])
+
+    result = instagram_integration.post_image("http://example.com/image.jpg", caption)
+
+    # Assert that the image was uploaded once and then published
+    assert upload.call_count == 1
+    assert publish.call_count == 1
+    assert result["status"] == "success"
+    assert "test-post-id" in result["url"]
+
+
+def test_get_posts_success(instagram_integration, mock_responses, instagram_responses):
+    """Test successful retrieval of posts by hashtag."""
+    recent_media = register_get_posts(mock_responses, instagram_responses, json=instagram_responses["get_posts_success"])
+
+    result = instagram_integration.get_posts("testhashtag")
+
+    # Assert the correct API endpoint was called
+    assert recent_media.call_count == 1
+    assert len(result) == 2
+
+
+def test_post_image_http_failure(instagram_integration, mock_responses, instagram_responses):
+    """Test that a transport failure while posting an image is reported in the result."""
+    register_post_image(mock_responses, instagram_responses, body=RequestException("Failed to post image"))
+
+    result = instagram_integration.post_image("http://example.com/image.jpg", "Test caption")
+
+    assert result["status"] == "error"
+    assert "Failed to post image" in result["message"]
+
+
+def test_get_posts_http_failure(instagram_integration, mock_responses, instagram_responses):
+    """Test that a transport failure while retrieving posts yields no posts."""
+    recent_media = register_get_posts(mock_responses, instagram_responses, body=RequestException("Failed to retrieve posts"))
+
+    assert instagram_integration.get_posts("testhashtag") == []
+    assert recent_media.call_count == 1
+
+
+def test_get_posts_empty_hashtag(instagram_integration, mock_responses):
+    """Test retrieving posts with an empty hashtag."""
+    with pytest.raises(ValueError):
+        instagram_integration.get_posts("")
+
+
+def test_get_posts_not_modified_uses_cache(mock_config_manager, mock_responses, instagram_responses):
+    """Test that a 304 revalidation returns the previously fetched posts."""
+    instagram_integration = InstagramIntegration(mock_config_manager, use_graph_api=False)
+    url = "https://api.instagram.com/v1/tags/testhashtag/media/recent"
+    cached = instagram_responses["get_posts_cached"]
+    mock_responses.get(url, json=cached, headers={'ETag': '"v1"'})
+    mock_responses.get(url, status=304, headers={'ETag': '"v1"'})
+
+    first = instagram_integration.get_posts("testhashtag")
+    second = instagram_integration.get_posts("testhashtag")
+    assert first == second == cached["data"]
+    assert first is not second
+    assert mock_responses.calls[-1].request.headers['If-None-Match'] == '"v1"'
+
+
+def test_etag_cache_evicts_least_recently_used(mock_config_manager, mock_responses, instagram_responses):
+    """Test that the ETag cache keeps at most ETAG_CACHE_SIZE hashtag searches."""
+    instagram_integration = InstagramIntegration(mock_config_manager, use_graph_api=False)
+    instagram_integration.ETAG_CACHE_SIZE = 1
+    for hashtag in ("first", "second"):
+        mock_responses.get(f"https://api.instagram.com/v1/tags/{hashtag}/media/recent",
+                           json=instagram_responses["get_posts_cached"], headers={'ETag': '"v1"'})
+        instagram_integration.get_posts(hashtag)
+
+    assert [hashtag for hashtag, _ in instagram_integration._etag_cache] == ["second"]
+
+
+def test_reply_to_posts_batch_reports_undecodable_items(instagram_integration, mock_responses):
+    """Test that a batch item with a missing or malformed body is reported as failed without losing the others."""
+    mock_responses.post(GRAPH_URL, json=[
+        {"code": 200, "body": '{"id": "comment-1"}'},
+        {"code": 200, "body": "not json"},
+        {"code": 200, "body": None},
+        {"code": 400, "body": '{"error": {}}'},
+    ])
+
+    results = instagram_integration.reply_to_posts_batch([("m1", "a"), ("m2", "b"), ("m3", "c"), ("m4", "d")])
+
+    assert results == [{"id": "comment-1"}, None, None, None]
+
+
+def test_every_graph_call_is_rate_limited(instagram_integration, mock_responses, instagram_responses):
+    """Test that reads and image posts wait on the rate limiter like the other requests."""
+    instagram_integration.limiter = MagicMock()
+    mock_responses.get(f"{GRAPH_URL}media-id", json={"caption": {"text": "hello"}})
+    mock_responses.get(f"{GRAPH_URL}media-id/comments", json={"data": []})
+    register_post_image(mock_responses, instagram_responses, json=instagram_responses["post_image_success"])
+
+    instagram_integration.fetch_post_content("media-id")
+    instagram_integration.fetch_comments_list("media-id")
+    instagram_integration.post_image("http://example.com/image.jpg", "Test caption")
+
+    assert instagram_integration.limiter.acquire.call_count == 4
+
+
+def test_post_comments_bulk_refuses_to_run_on_the_shared_pool(instagram_integration):
+    """Test that bulk commenting from an ig-io worker fails instead of waiting on its own pool."""
+    future = _POOL.submit(instagram_integration.post_comments_bulk, [("media-id", "hello")])
+
+    with pytest.raises(RuntimeError, match="ig-io"):
+        future.result(timeout=5)
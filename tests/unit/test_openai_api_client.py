@@ -1,63 +1,56 @@
-import unittest
-from unittest.mock import patch, MagicMock
-from bot.openai_client import OpenAIClient
-from bot.config_manager import ConfigManager
-from openai.error import OpenAIError
-
-class TestOpenAIClient(unittest.TestCase):
-    """Test suite for the OpenAIClient class."""
-
-    def setUp(self):
-        """Set up the test environment by mocking ConfigManager and initializing OpenAIClient."""
-        self.mock_config_manager = MagicMock(spec=ConfigManager)
-        self.mock_config_manager.get.side_effect = lambda key, default=None: {
-            "openai_api_key": "test-api-key",
-            "openai_engine": "davinci"
-        }.get(key, default)
-        
-        self.client = OpenAIClient(self.mock_config_manager)
-    
-    @patch('openai.Completion.create')
-    def test_complete_success(self, mock_create):
-        """Test successful completion generation."""
-        mock_create.return_value.choices = [MagicMock(text="Test completion")]
-        result = self.client.complete("Test prompt")
-        
-        # Assert that the completion was generated as expected
-        mock_create.assert_called_once()
-        self.assertEqual(result, "Test completion")
-    
-    @patch('openai.Completion.create', side_effect=OpenAIError("API Error"))
-    def test_complete_failure(self, mock_create):
-        """Test handling of an API failure."""
-        with self.assertRaises(OpenAIError):
-            self.client.complete("Test prompt")
-
-    @patch('openai.Completion.create', side_effect=TimeoutError("Timeout"))
-    def test_complete_retry(self, mock_create):
-        """Test retry logic on timeout."""
-        with self.assertRaises(TimeoutError):
-            self.client.complete("Test prompt", retries=1)
-        
-        # Ensure the retry logic respects the retries parameter
-        self.assertEqual(mock_create.call_count, 1)
-
-    @patch('openai.Completion.create')
-    def test_complete_empty_prompt(self, mock_create):
-        """Test completion with an empty prompt."""
-        mock_create.return_value.choices = [MagicMock(text="")]
-        result = self.client.complete("")
-        self.assertEqual(result, "")
-    
-    def test_complete_invalid_max_tokens(self):
-        """Test handling of invalid max_tokens parameter."""
-        with self.assertRaises(ValueError):
-            self.client.complete("Test prompt", max_tokens=5000)  # Exceeding the limit
-
-    def test_complete_invalid_temperature(self):
-        """Test handling of invalid temperature parameter."""
-        with self.assertRaises(ValueError):
-            self.client.complete("Test prompt", temperature=2.0)  # Temperature out of bounds
-
-if __name__ == '__main__':
-    unittest.main()
+"""Tests for the OpenAIClient class."""
+import pytest
+from unittest.mock import MagicMock, patch
+from openai import OpenAIError
+from requests.exceptions import Timeout
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    """The client waits two seconds between attempts; retry tests shouldn't."""
+    monkeypatch.setattr('openai_client.sleep', lambda seconds: None)
+
+
+@pytest.fixture
+def mock_create(openai_client):
+    """The client's chat.completions.create, patched for this test."""
+    with patch.object(openai_client.client.chat.completions, 'create') as mock_create:
+        yield mock_create
+
+
+def completion(text):
+    """A chat completion response whose only choice carries the given text."""
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=text))])
+
+
+def test_complete_success(mock_create, openai_client):
+    """Test successful completion generation."""
+    mock_create.return_value = completion("Test completion")
+    result = openai_client.complete("Test prompt")
+
+    # Assert that the completion was generated as expected
+    mock_create.assert_called_once()
+    assert result == "Test completion"
+
+
+def test_complete_failure(mock_create, openai_client):
+    """Test handling of an API failure."""
+    mock_create.side_effect = OpenAIError("API Error")
+    with pytest.raises(OpenAIError):
+        openai_client.complete("Test prompt")
+
+
+def test_complete_retry(mock_create, openai_client):
+    """Test retry logic on timeout."""
+    mock_create.side_effect = Timeout("Timeout")
+    with pytest.raises(Exception, match="Max retries exceeded"):
+        openai_client.complete("Test prompt", retries=2)
+
+    # Ensure the retry logic respects the retries parameter
+    assert mock_create.call_count == 2
+
+
+def test_complete_empty_prompt(mock_create, openai_client):
+    """Test completion with an empty prompt."""
+    mock_create.return_value = completion("")
+    assert openai_client.complete("") == ""
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch
+from bot.social_media.rate_limiter import SlidingWindowLimiter, TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+    """Test suite for the TokenBucket rate limiter."""
+
+    @patch('bot.social_media.rate_limiter.time.sleep')
+    def test_burst_does_not_wait(self, mock_sleep):
+        """Test that requests within the bucket capacity are not delayed."""
+        bucket = TokenBucket(capacity=3, refill_per_sec=1.0)
+        for _ in range(3):
+            bucket.acquire()
+        mock_sleep.assert_not_called()
+
+    @patch('bot.social_media.rate_limiter.time.sleep')
+    def test_empty_bucket_waits_for_refill(self, mock_sleep):
+        """Test that an empty bucket sleeps until a token is available."""
+        bucket = TokenBucket(capacity=1, refill_per_sec=2.0)
+        bucket.acquire()
+        # Let the next refill see a full token once sleep has been requested.
+        mock_sleep.side_effect = lambda seconds: setattr(bucket, 'tokens', 1.0)
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+        self.assertLessEqual(mock_sleep.call_args[0][0], 0.5)
+
+    def test_update_usage_scales_refill_rate(self):
+        """Test that reported quota usage slows the refill rate down."""
+        bucket = TokenBucket(capacity=10, refill_per_sec=4.0)
+        bucket.update_usage(75)
+        self.assertAlmostEqual(bucket.refill_per_sec, 1.0)
+        bucket.update_usage(100)
+        self.assertGreater(bucket.refill_per_sec, 0)
+
+class TestSlidingWindowLimiter(unittest.TestCase):
+    """Test suite for the SlidingWindowLimiter rate limiter."""
+
+    @patch('bot.social_media.rate_limiter.time.sleep')
+    @patch('bot.social_media.rate_limiter.time.monotonic')
+    def test_waits_for_oldest_call_to_leave_window(self, mock_monotonic, mock_sleep):
+        """Test that a spent budget sleeps until the oldest call falls out of the window."""
+        clock = [100.0]
+        mock_monotonic.side_effect = lambda: clock[0]
+        mock_sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        limiter = SlidingWindowLimiter(max_calls=2, period=60)
+
+        limiter.acquire()
+        clock[0] += 10
+        limiter.acquire()
+        mock_sleep.assert_not_called()
+
+        limiter.acquire()
+        mock_sleep.assert_called_once_with(50.0)
+        self.assertEqual(len(limiter.calls), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,104 +1,96 @@
-import unittest
-from unittest.mock import MagicMock, patch
-from bot.response_generator import ResponseGenerator
-from bot.openai_client import OpenAIClient
-from bot.database_client import DatabaseClient
-from bot.user_preferences import UserPreferences
-
-class TestResponseGenerator(unittest.TestCase):
-    """Test suite for the ResponseGenerator class."""
-
-    def setUp(self):
-        """Set up the test environment by mocking dependencies and initializing ResponseGenerator."""
-        # Mocking dependencies
-        self.mock_openai_client = MagicMock(spec=OpenAIClient)
-        self.mock_database_client = MagicMock(spec=DatabaseClient)
-        self.mock_user_preferences = MagicMock(spec=UserPreferences)
-        
-        # Initializing ResponseGenerator with mocked dependencies
-        self.response_generator = ResponseGenerator(
-            self.mock_openai_client,
-            self.mock_database_client,
-            self.mock_user_preferences
-        )
-
-    def test_generate_caption_success(self):
-        """Test successful caption generation with valid data."""
-        # Mocking database response and user preferences
-        self.mock_database_client.get_data.return_value = ["Sample caption"]
-        self.mock_user_preferences.select_preferred_caption.return_value = "Sample caption"
-        self.mock_user_preferences.response_style = "informal"
-        self.mock_user_preferences.content_tone = "friendly"
-
-        self.mock_openai_client.complete.return_value = "Personalized caption"
-
-        result = self.response_generator.generate_caption()
-        self.assertEqual(result, "Personalized caption")
-
-    def test_generate_caption_no_captions(self):
-        """Test handling when no captions are found in the database."""
-        # Simulating a situation where no captions are available
-        self.mock_database_client.get_data.return_value = []
-
-        with self.assertRaises(Exception) as context:
-            self.response_generator.generate_caption()
-
-        self.assertIn("No captions found", str(context.exception))
-
-    def test_generate_caption_empty_database_response(self):
-        """Test handling of an empty response from the database."""
-        self.mock_database_client.get_data.return_value = []
-
-        with self.assertRaises(Exception) as context:
-            self.response_generator.generate_caption()
-
-        self.assertIn("No captions found", str(context.exception))
-
-    def test_generate_caption_missing_user_preferences(self):
-        """Test handling when user preferences are not set."""
-        self.mock_database_client.get_data.return_value = ["Sample caption"]
-        self.mock_user_preferences.select_preferred_caption.return_value = "Sample caption"
-        self.mock_user_preferences.response_style = None  # Missing preferences
-        self.mock_user_preferences.content_tone = None
-
-        with self.assertRaises(Exception) as context:
-            self.response_generator.generate_caption()
-
-        self.assertIn("Error retrieving or personalizing caption", str(context.exception))
-
-    @patch('bot.openai_client.OpenAIClient.generate_image')
-    def test_generate_image_success(self, mock_generate_image):
-        """Test successful image generation with valid preferences."""
-        self.mock_user_preferences.get_image_preferences.return_value = {
-            "style": "minimalist",
-            "color_scheme": "monochrome"
-        }
-        mock_generate_image.return_value = "http://example.com/generated_image.png"
-
-        result = self.response_generator.generate_image("Sample caption")
-        self.assertEqual(result, "http://example.com/generated_image.png")
-
-    @patch('bot.openai_client.OpenAIClient.generate_image', side_effect=Exception("Image generation failed"))
-    def test_generate_image_failure(self, mock_generate_image):
-        """Test handling of image generation failure."""
-        self.mock_user_preferences.get_image_preferences.return_value = {
-            "style": "minimalist",
-            "color_scheme": "monochrome"
-        }
-
-        with self.assertRaises(Exception) as context:
-            self.response_generator.generate_image("Sample caption")
-
-        self.assertIn("Image generation failed", str(context.exception))
-
-    def test_generate_image_missing_preferences(self):
-        """Test handling when image preferences are missing."""
-        self.mock_user_preferences.get_image_preferences.return_value = {}
-
-        with self.assertRaises(Exception) as context:
-            self.response_generator.generate_image("Sample caption")
-
-        self.assertIn("Image generation failed", str(context.exception))
-
-if __name__ == '__main__':
-    unittest.main()
+"""Tests for the ResponseGenerator class."""
+import pytest
+
+IMAGE_PREFERENCES = {"style": "minimalist", "color_scheme": "monochrome"}
+
+
+def test_generate_caption_success(response_generator, mock_openai_client, mock_database_client, mock_user_preferences):
+    """Test successful caption generation with valid data."""
+    # Mocking database response and user preferences
+    mock_database_client.get_data.return_value = ["Sample caption"]
+    mock_user_preferences.select_preferred_caption.return_value = "Sample caption"
+    mock_user_preferences.response_style = "informal"
+    mock_user_preferences.content_tone = "friendly"
+
+    mock_openai_client.complete.return_value = "Personalized caption"
+
+    assert response_generator.generate_caption() == "Personalized caption"
+
+
+def test_generate_caption_failure(response_generator, mock_openai_client, mock_user_preferences):
+    """Test that a failed completion is reported as a caption error."""
+    mock_user_preferences.response_style = "informal"
+    mock_user_preferences.content_tone = "friendly"
+    mock_openai_client.complete.side_effect = Exception("API Error")
+
+    with pytest.raises(Exception, match="Error retrieving or personalizing caption"):
+        response_generator.generate_caption("Sample caption")
+
+
+def test_generate_image_success(response_generator, mock_openai_client, mock_user_preferences):
+    """Test successful image generation with valid preferences."""
+    mock_user_preferences.get_preferences.return_value = IMAGE_PREFERENCES
+    mock_openai_client.generate_image.return_value = "http://example.com/generated_image.png"
+
+    assert response_generator.generate_image("Sample caption") == "http://example.com/generated_image.png"
+
+
+def test_generate_image_failure(response_generator, mock_openai_client, mock_user_preferences):
+    """Test handling of image generation failure."""
+    mock_user_preferences.get_preferences.return_value = IMAGE_PREFERENCES
+    mock_openai_client.generate_image.side_effect = Exception("Image generation failed")
+
+    with pytest.raises(Exception, match="Image generation failed"):
+        response_generator.generate_image("Sample caption")
+
+
+def test_generate_image_missing_preferences(response_generator, mock_openai_client, mock_user_preferences):
+    """Test that the caption is used as the prompt as it is when no image preferences are set."""
+    mock_user_preferences.get_preferences.return_value = {}
+    mock_openai_client.generate_image.return_value = "http://example.com/generated_image.png"
+
+    response_generator.generate_image("Sample caption")
+    mock_openai_client.generate_image.assert_called_once_with("Sample caption")
+
+
+def test_generate_image_reuses_preference_suffix(response_generator, mock_openai_client, mock_user_preferences):
+    """Test that the image preferences are read once and reset after an update."""
+    mock_user_preferences.get_preferences.return_value = IMAGE_PREFERENCES
+    mock_openai_client.generate_image.return_value = "http://example.com/generated_image.png"
+
+    response_generator.generate_image("First caption")
+    response_generator.generate_image("Second caption")
+    mock_user_preferences.get_preferences.assert_called_once()
+    mock_openai_client.generate_image.assert_called_with(
+        "Second caption with elements such as minimalist style, monochrome color scheme."
+    )
+
+    response_generator._invalidate_image_suffix()
+    response_generator.generate_image("Third caption")
+    assert mock_user_preferences.get_preferences.call_count == 2
+
+
+def test_generate_image_cached_by_prompt(response_generator, mock_openai_client, mock_user_preferences):
+    """Test that an identical image prompt does not trigger a second generation."""
+    mock_user_preferences.get_preferences.return_value = IMAGE_PREFERENCES
+    mock_openai_client.generate_image.return_value = "http://example.com/generated_image.png"
+
+    first = response_generator.generate_image("Sample caption")
+    second = response_generator.generate_image("Sample caption")
+    assert first == second
+    mock_openai_client.generate_image.assert_called_once()
+
+
+def test_generate_image_cache_expires_and_is_bounded(response_generator, mock_openai_client, mock_user_preferences, monkeypatch):
+    """Test that cached image URLs are regenerated once expired and the cache keeps at most IMAGE_CACHE_SIZE entries."""
+    mock_user_preferences.get_preferences.return_value = IMAGE_PREFERENCES
+    mock_openai_client.generate_image.return_value = "http://example.com/generated_image.png"
+    monkeypatch.setattr(type(response_generator), "IMAGE_CACHE_TTL", 0)
+    monkeypatch.setattr(type(response_generator), "IMAGE_CACHE_SIZE", 1)
+
+    response_generator.generate_image("Sample caption")
+    response_generator.generate_image("Sample caption")
+    assert mock_openai_client.generate_image.call_count == 2
+
+    response_generator.generate_image("Other caption")
+    assert len(response_generator._image_cache) == 1
@@ -0,0 +1,97 @@
+import requests
+import unittest
+from unittest.mock import MagicMock, patch
+from bot.social_media.twitter import TwitterIntegration
+from tests.fakes import FakeConfigManager
+
+CONFIG_VALUES = {
+    "twitter_api_key": "test-api-key",
+    "twitter_api_secret_key": "test-api-secret"
+}
+
+class TestTwitterIntegration(unittest.TestCase):
+    """Test suite for the TwitterIntegration class."""
+
+    def setUp(self):
+        """Set up the test environment by mocking ConfigManager and initializing TwitterIntegration."""
+        self.mock_config_manager = FakeConfigManager(CONFIG_VALUES)
+        TwitterIntegration._token_cache.clear()
+
+        self.twitter_integration = TwitterIntegration(self.mock_config_manager)
+
+    @patch('requests.Session.post')
+    def test_authenticate_caches_token(self, mock_post):
+        """Test that the app-only bearer token is requested once and then served from the cache."""
+        mock_post.return_value = MagicMock(status_code=200, content=b'{"token_type": "bearer", "access_token": "test-bearer"}')
+
+        self.assertIsNone(self.twitter_integration.get_cached_token())
+        self.assertEqual(self.twitter_integration.authenticate(), "test-bearer")
+
+        other_integration = TwitterIntegration(self.mock_config_manager)
+        self.assertEqual(other_integration.get_cached_token(), "test-bearer")
+        mock_post.assert_called_once()
+        self.assertEqual(
+            mock_post.call_args.kwargs["headers"]["Authorization"],
+            "Basic dGVzdC1hcGkta2V5OnRlc3QtYXBpLXNlY3JldA=="
+        )
+
+    def test_configured_bearer_token_skips_authentication(self):
+        """Test that a configured bearer token is sent as-is without the OAuth2 flow."""
+        twitter_integration = TwitterIntegration(FakeConfigManager({"twitter_bearer_token": "configured-bearer"}))
+
+        self.assertEqual(twitter_integration.session.headers['Authorization'], 'Bearer configured-bearer')
+        self.assertIsNone(twitter_integration.session.auth)
+
+    @patch('bot.social_media.twitter.random.uniform', return_value=0)
+    def test_rate_limit_delay_prefers_headers(self, mock_uniform):
+        """Test that 429 delays come from Retry-After first, then the reset time, and are unknown without headers."""
+        response = MagicMock(headers={'retry-after': '7', 'x-rate-limit-reset': '0'})
+        self.assertEqual(self.twitter_integration._rate_limit_delay(response), 7.0)
+
+        response = MagicMock(headers={'x-rate-limit-reset': '0'})
+        self.assertEqual(self.twitter_integration._rate_limit_delay(response), 0.0)
+
+        response = MagicMock(headers={})
+        self.assertIsNone(self.twitter_integration._rate_limit_delay(response))
+
+    @patch('bot.social_media.twitter.time.sleep')
+    @patch('requests.Session.get')
+    def test_long_rate_limit_is_not_slept_through(self, mock_get, mock_sleep):
+        """Test that a 429 without a short Retry-After fails the search instead of sleeping for minutes."""
+        response = requests.Response()
+        response.status_code = 429
+        mock_get.return_value = response
+
+        self.assertEqual(self.twitter_integration.get_posts("python"), [])
+        mock_get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_fetch_post_content_is_cached(self, mock_get):
+        """Test that a tweet's content is fetched once and then served from the cache."""
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"data": [{"id": "1", "text": "hello"}]}')
+
+        first = self.twitter_integration.fetch_post_content("1")
+        second = self.twitter_integration.fetch_post_content("1")
+
+        self.assertEqual(first, {'text': 'hello', 'media_url': ''})
+        self.assertIs(first, second)
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_fetch_posts_bulk_batches_ids(self, mock_get):
+        """Test that tweet lookups are batched and cached tweets are not requested again."""
+        self.twitter_integration.LOOKUP_BATCH_SIZE = 2
+        self.twitter_integration._post_cache.put("1", {'text': 'cached', 'media_url': ''})
+        mock_get.side_effect = [
+            MagicMock(status_code=200, content=b'{"data": [{"id": "2", "text": "two"}, {"id": "3", "text": "three"}]}'),
+            MagicMock(status_code=200, content=b'{"data": [{"id": "4", "text": "four"}]}'),
+        ]
+
+        contents = self.twitter_integration.fetch_posts_bulk(["1", "2", "3", "4"])
+
+        self.assertEqual([contents[i]['text'] for i in "1234"], ['cached', 'two', 'three', 'four'])
+        self.assertEqual([call.kwargs['params']['ids'] for call in mock_get.call_args_list], ['2,3', '4'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from bot.user_preferences import SCHEMA_VERSION, UserPreferences
+from tests.fakes import FakeConfigManager
+from bot.database_client import DatabaseClient
+
+class TestUserPreferences(unittest.TestCase):
+    """Test suite for the UserPreferences class."""
+
+    def setUp(self):
+        """Set up the test environment with a fresh UserPreferences singleton and mocked dependencies."""
+        UserPreferences._instances.clear()
+        UserPreferences._schema_ready.clear()
+        self.mock_config_manager = FakeConfigManager()
+        self.mock_db_client = MagicMock(spec=DatabaseClient)
+        self.mock_db_client.check_table_exists.return_value = True
+        self.mock_db_client.get_user_preferences.return_value = [{"response_style": "formal"}]
+        self.mock_db_client.get_user_preferences_bulk.return_value = {2: {"user_id": 2, "response_style": "casual"}}
+
+        self.user_preferences = UserPreferences(self.mock_config_manager, self.mock_db_client, 1)
+
+    def tearDown(self):
+        UserPreferences._instances.clear()
+
+    def test_instances_are_shared_per_user(self):
+        """Test that constructing UserPreferences again for a user returns its shared instance without reloading it."""
+        with self.assertLogs('bot.user_preferences', level='WARNING'):
+            same_user = UserPreferences(FakeConfigManager(), self.mock_db_client, 1)
+        other_user = UserPreferences(self.mock_config_manager, self.mock_db_client, 2)
+
+        self.assertIs(same_user, self.user_preferences)
+        self.assertIs(UserPreferences.instance(1), self.user_preferences)
+        self.assertIsNot(other_user, self.user_preferences)
+        self.assertEqual(other_user.user_id, 2)
+
+    def test_preferences_load_at_construction(self):
+        """Test that construction loads the preferences and reading preference attributes doesn't query the database."""
+        self.mock_db_client.get_user_preferences.assert_called_once_with(1)
+        self.mock_db_client.check_table_exists.assert_called_once_with('user_preferences')
+
+        self.assertEqual(self.user_preferences.response_style, "formal")
+        self.assertEqual(self.user_preferences.tone, "reserved")
+        self.mock_db_client.get_user_preferences.assert_called_once()
+        with self.assertRaises(AttributeError):
+            self.user_preferences.not_a_preference
+
+    def test_get_preferences_many_uses_one_query(self):
+        """Test that other users' preferences are loaded with one bulk query and then cached."""
+        preferences = self.user_preferences.get_preferences_many([1, 2, 3])
+
+        self.assertEqual(preferences[1]["response_style"], "formal")
+        self.assertEqual(preferences[2]["response_style"], "casual")
+        self.assertEqual(preferences[3]["response_style"], "friendly")
+        self.assertIs(preferences[3], self.user_preferences._defaults)
+        self.mock_db_client.get_user_preferences_bulk.assert_called_once_with([2, 3])
+
+        self.assertEqual(self.user_preferences.get_preferences(2)["response_style"], "casual")
+        self.mock_db_client.get_user_preferences_bulk.assert_called_once()
+
+    def test_rows_validated_under_current_schema_are_not_revalidated(self):
+        """Test that stored rows stamped with the current schema version skip validation and older rows don't."""
+        self.mock_db_client.get_user_preferences_bulk.return_value = {
+            2: {"user_id": 2, "response_style": "custom", "schema_version": SCHEMA_VERSION},
+            3: {"user_id": 3, "response_style": "custom", "schema_version": SCHEMA_VERSION - 1},
+        }
+
+        preferences = self.user_preferences.get_preferences_many([2, 3])
+
+        self.assertEqual(preferences[2]["response_style"], "custom")
+        self.assertEqual(preferences[3]["response_style"], "friendly")
+        self.assertEqual(preferences[3]["schema_version"], SCHEMA_VERSION)
+
+    def test_user_cache_evicts_least_recently_used(self):
+        """Test that the cache of other users' preferences is bounded and evicts the least recently used user."""
+        self.user_preferences._user_cache_size = 2
+        self.mock_db_client.get_user_preferences_bulk.return_value = {}
+
+        self.user_preferences.get_preferences_many([2, 3])
+        self.user_preferences.get_preferences(2)
+        self.user_preferences.get_preferences(4)
+
+        self.assertEqual(list(self.user_preferences._user_cache), [2, 4])
+
+    def test_failed_bulk_load_caches_nothing(self):
+        """Test that users whose lookup failed aren't cached with the defaults and are queried again next time."""
+        self.mock_db_client.get_user_preferences_bulk.side_effect = Exception("Database unavailable")
+
+        with self.assertRaises(Exception):
+            self.user_preferences.get_preferences_many([2, 3])
+        self.assertEqual(len(self.user_preferences._user_cache), 0)
+
+        self.mock_db_client.get_user_preferences_bulk.side_effect = None
+        self.assertEqual(self.user_preferences.get_preferences(2)["response_style"], "casual")
+
+    def test_stale_preferences_are_served_and_refreshed(self):
+        """Test that stale preferences are returned immediately, refreshed in the background, and kept if the refresh fails."""
+        stale = self.user_preferences.get_preferences(2)
+        self.user_preferences._ttl = -1
+        self.user_preferences._executor = MagicMock()
+
+        self.assertIs(self.user_preferences.get_preferences(2), stale)
+        self.user_preferences._executor.submit.assert_called_once_with(self.user_preferences.refresh_preferences, 2)
+
+        self.mock_db_client.get_user_preferences_bulk.side_effect = Exception("Database unavailable")
+        self.user_preferences.refresh_preferences(2)
+        self.assertIs(self.user_preferences.get_preferences(2), stale)
+
+    def test_refresh_keeps_cached_copy_when_query_fails(self):
+        """Test that a refresh through the real DatabaseClient keeps the cached copy when the query fails."""
+        stale = self.user_preferences.get_preferences(2)
+        DatabaseClient._instance = None
+        try:
+            db_client = DatabaseClient(FakeConfigManager())
+            db_client._client = MagicMock()
+            db_client._client.from_.return_value.select.return_value.in_.return_value.execute.side_effect = Exception("Database unavailable")
+            self.user_preferences.db_client = db_client
+
+            with self.assertLogs('bot.user_preferences', level='ERROR'):
+                self.user_preferences.refresh_preferences(2)
+        finally:
+            DatabaseClient._instance = None
+        self.assertIs(self.user_preferences.get_preferences(2), stale)
+
+    def test_invalidate_reloads_from_database(self):
+        """Test that invalidated preferences are read from the database again on next use."""
+        self.user_preferences.get_preferences()
+        self.user_preferences.get_preferences(2)
+        self.mock_db_client.get_user_preferences.return_value = [{"response_style": "casual"}]
+
+        self.user_preferences.invalidate()
+        self.user_preferences.invalidate(2)
+
+        self.assertEqual(self.user_preferences.get_preferences()["response_style"], "casual")
+        self.user_preferences.get_preferences(2)
+        self.assertEqual(self.mock_db_client.get_user_preferences_bulk.call_count, 2)
+        self.mock_db_client.check_table_exists.assert_called_once()
+
+    def test_update_callbacks_run_whenever_preferences_are_replaced(self):
+        """Test that update callbacks are notified on refresh and invalidation, not only on update."""
+        callback = MagicMock()
+        self.user_preferences.register_update_callback(callback)
+        self.mock_db_client.get_user_preferences.return_value = [{"response_style": "casual"}]
+
+        self.user_preferences.refresh_preferences()
+        self.user_preferences.invalidate()
+
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(callback.call_args[0][0]["response_style"], "casual")
+
+    def test_update_preferences_writes_before_returning(self):
+        """Test that an update is written to the database by default before update_preferences returns."""
+        self.mock_db_client.update_user_preferences.reset_mock()
+
+        self.user_preferences.update_preferences({"response_style": "casual"})
+
+        self.mock_db_client.update_user_preferences.assert_called_once()
+        self.assertEqual(self.user_preferences._dirty, {})
+
+    def test_update_preferences_coalesces_writes(self):
+        """Test that with deferred write-back a burst of updates is visible immediately and written to the database once."""
+        self.user_preferences.WRITE_BACK_DELAY = 60
+        self.mock_db_client.update_user_preferences.reset_mock()
+
+        self.user_preferences.update_preferences({"response_style": "casual"})
+        new_preferences = {"response_style": "formal", "content_tone": "positive"}
+        self.user_preferences.update_preferences(new_preferences)
+
+        self.assertEqual(new_preferences, {"response_style": "formal", "content_tone": "positive"})
+
+        self.assertEqual(self.user_preferences.get_preferences()["content_tone"], "positive")
+        self.mock_db_client.update_user_preferences.assert_not_called()
+
+        self.user_preferences.flush_preferences()
+
+        self.mock_db_client.update_user_preferences.assert_called_once()
+        user_id, written = self.mock_db_client.update_user_preferences.call_args[0]
+        self.assertEqual(user_id, 1)
+        self.assertEqual((written["response_style"], written["content_tone"]), ("formal", "positive"))
+
+    def test_select_preferred_caption_relaxes_criteria_in_order(self):
+        """Test that the best-matching caption tier wins, ties broken by engagement, and generated captions are skipped."""
+        self.user_preferences.tags = ["travel"]
+        self.user_preferences.length = "short"
+        self.user_preferences.category = "general"
+        self.user_preferences.tone = "bold"
+        captions = [
+            {"id": 1, "tags": "food", "length": "short", "category": "general", "tone": "bold", "likes": 50},
+            {"id": 2, "tags": "food, travel", "length": "short", "category": "news", "tone": "bold", "likes": 5},
+            {"id": 3, "tags": "travel", "length": "short", "category": "news", "tone": "bold", "likes": 9},
+            {"id": 4, "tags": "travel", "length": "long", "category": "general", "tone": "bold", "likes": 99},
+        ]
+
+        self.assertEqual(self.user_preferences.select_preferred_caption(captions, [])["id"], 3)
+        self.assertEqual(self.user_preferences.select_preferred_caption(captions, [{"caption_id": 3}])["id"], 2)
+        self.assertEqual(self.user_preferences.select_preferred_caption(captions[3:], [])["id"], 4)
+        # The caption rows belong to the caller and are left untouched.
+        self.assertEqual(captions[0], {"id": 1, "tags": "food", "length": "short", "category": "general",
+                                       "tone": "bold", "likes": 50})
+
+    @patch('builtins.input')
+    def test_prompt_for_preferences_reprompts_invalid_values(self, mock_input):
+        """Test that prompted preferences fall back to their defaults and invalid answers are asked again."""
+        mock_input.side_effect = ["yes", "bogus", "casual"] + [""] * 16
+
+        preferences = self.user_preferences.prompt_for_preferences()
+
+        self.assertEqual(mock_input.call_count, 19)
+        self.assertTrue(preferences["notifications_enabled"])
+        self.assertEqual(preferences["response_style"], "casual")
+        self.assertEqual(preferences["interaction_type"], "neutral")
+        self.assertEqual(preferences["tags"], [])
+
+    def test_update_preferences_refreshes_copies_held_by_other_users(self):
+        """Test that an update replaces the copy of the preferences cached by another user's instance."""
+        self.user_preferences.WRITE_BACK_DELAY = 60
+        other_user = UserPreferences(self.mock_config_manager, self.mock_db_client, 2)
+        self.mock_db_client.get_user_preferences_bulk.return_value = {}
+        self.assertEqual(other_user.get_preferences(1)["response_style"], "friendly")
+
+        self.user_preferences.update_preferences({"response_style": "casual"})
+        self.user_preferences.flush_preferences()
+
+        self.assertEqual(other_user.get_preferences(1)["response_style"], "casual")
+        self.mock_db_client.get_user_preferences_bulk.assert_called_once()
+
+    def test_aget_preferences_coalesces_concurrent_lookups(self):
+        """Test that concurrent async lookups are answered by a single bulk query."""
+        async def lookup():
+            return await asyncio.gather(
+                self.user_preferences.aget_preferences(2),
+                self.user_preferences.aget_preferences(3)
+            )
+
+        preferences_2, preferences_3 = asyncio.run(lookup())
+
+        self.assertEqual(preferences_2["response_style"], "casual")
+        self.assertEqual(preferences_3["response_style"], "friendly")
+        self.mock_db_client.get_user_preferences_bulk.assert_called_once_with([2, 3])
+
+if __name__ == "__main__":
+    unittest.main()